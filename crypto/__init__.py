@@ -1,3 +1,30 @@
-from .elgamal import ElGamalCiphertext, ElGamalKeyPair
+"""BabyJubJub ElGamal voting crypto.
 
-__all__ = ["ElGamalCiphertext", "ElGamalKeyPair"]
+Submodules are imported on first attribute access so that `import crypto`
+stays cheap for workers and CLI tools that only need part of the package.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ElGamalCiphertext": ".elgamal",
+    "ElGamalKeyPair": ".elgamal",
+    "PartialDecryption": ".threshold",
+    "ThresholdKey": ".threshold",
+    "TrusteeShare": ".threshold",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
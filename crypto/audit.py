@@ -0,0 +1,309 @@
+"""Independent-auditor verification of a published tally.
+
+Streams EncryptedVoteCast records, recomputes the per-candidate aggregates
+with the batch/parallel path, and checks them against the aggregated C1/C2
+totals in the tally public signals. The claimed results are checked against
+the published TallyResultPoints by computing results[j] * G with the
+fixed-base generator table, so no discrete-log search is ever needed and
+the audit is strictly cheaper than tallying. Correctness of the decryption
+itself is covered by the tally proof that Voting.updateTallyResults
+verifies on-chain.
+
+The report is signed with a Schnorr signature on BabyJubJub.
+
+Usage:
+    python -m crypto.audit --events events.jsonl --published tally.json \\
+        --key auditor_key.json --output audit_report.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+
+from .elgamal import (
+    SUBGROUP_ORDER, ElGamalKeyPair,
+    point_eq, point_sub, scalar_mul, generator_mul, sum_points, aggregate_votes,
+)
+from .events import record_to_ballot, read_records
+from .parallel import bounded_map, traced_map, chunked
+
+
+REPORT_VERSION = 1
+
+
+def published_tally_from_signals(results, public_signals):
+    """
+    Build a published tally from updateTallyResults arguments.
+
+    Args:
+        results: Per-candidate vote counts (TallyCompleted.results)
+        public_signals: Tally public signals in circuit declaration order
+
+    Returns:
+        Dictionary with pk, aggregated totals, result points and totals
+    """
+    n = len(results)
+    values = [int(v) for v in public_signals]
+    if len(values) != 6 * n + 3:
+        raise ValueError(f"expected {6 * n + 3} tally public signals, got {len(values)}")
+
+    def column(k):
+        start = 2 + k * n
+        return values[start:start + n]
+
+    return {
+        "results": [int(r) for r in results],
+        "pk": (values[0], values[1]),
+        "c1Total": list(zip(column(0), column(1))),
+        "c2Total": list(zip(column(2), column(3))),
+        "resultPoints": list(zip(column(4), column(5))),
+        "totalVotes": values[-1],
+    }
+
+
+def load_published_tally(data):
+    """
+    Parse a published tally JSON document.
+
+    Accepts either {"results", "publicSignals"} or the named fields of the
+    tally circuit input (pkX, c1TotalX, ..., resultPointY, totalVotes).
+
+    Raises:
+        ValueError: If a per-candidate list does not have one entry per result
+    """
+    if "publicSignals" in data:
+        return published_tally_from_signals(data["results"], data["publicSignals"])
+
+    n = len(data["results"])
+
+    def points(xs, ys):
+        for name in (xs, ys):
+            if len(data[name]) != n:
+                raise ValueError(f"expected {n} values in {name}, got {len(data[name])}")
+        return [(int(x), int(y)) for x, y in zip(data[xs], data[ys])]
+
+    return {
+        "results": [int(r) for r in data["results"]],
+        "pk": (int(data["pkX"]), int(data["pkY"])),
+        "c1Total": points("c1TotalX", "c1TotalY"),
+        "c2Total": points("c2TotalX", "c2TotalY"),
+        "resultPoints": points("resultPointX", "resultPointY"),
+        "totalVotes": int(data["totalVotes"]),
+    }
+
+
+def _aggregate_records(args):
+    """
+    Parse and aggregate one chunk starting at stream position offset.
+
+    Returns:
+        (aggregated or None, count, rejected, (ingest_s, aggregate_s)) where
+        rejected lists (position, reason) for records that failed to decode
+    """
+    records, num_candidates, offset = args
+    start = time.perf_counter()
+    ballots = []
+    rejected = []
+    for i, record in enumerate(records, offset):
+        try:
+            ballots.append(record_to_ballot(record, num_candidates))
+        except (KeyError, TypeError, ValueError) as e:
+            rejected.append((i, str(e) or type(e).__name__))
+    parsed = time.perf_counter()
+    aggregated = aggregate_votes(ballots, num_candidates) if ballots else None
+    return aggregated, len(ballots), rejected, (parsed - start, time.perf_counter() - parsed)
+
+
+def stream_aggregate(records, num_candidates, workers=None, chunk_size=1024,
+                     on_chunk=None, trace_memory=False):
+    """
+    Aggregate EncryptedVoteCast records without holding every ballot in memory.
+
+    Records are parsed and aggregated chunk by chunk in worker processes
+    through parallel.bounded_map; finished chunks are folded into the
+    running totals as they complete. Records that fail to decode are
+    skipped and returned, not raised.
+
+    Args:
+        records: Iterable of EncryptedVoteCast records
+        num_candidates: Number of candidates
+        workers: Worker processes (1 runs in-process)
+        chunk_size: Records per work unit
+        on_chunk: Optional callback(count, ingest_seconds, aggregate_seconds,
+            worker_peak) called for every chunk, timed inside the worker
+        trace_memory: Trace each chunk's memory in its worker (worker_peak)
+
+    Returns:
+        (list of aggregated ElGamalCiphertext or None if no record decoded,
+        number of ballots, list of (record position, reason) rejected)
+
+    Raises:
+        ValueError: If the record stream is empty
+    """
+    totals = None
+    ballots = 0
+    rejected = []
+
+    jobs = ((chunk, num_candidates, k * chunk_size)
+            for k, chunk in enumerate(chunked(records, chunk_size)))
+    if trace_memory:
+        results = traced_map(_aggregate_records, jobs, workers)
+    else:
+        results = ((result, None) for result in bounded_map(_aggregate_records, jobs, workers))
+    for (aggregated, count, chunk_rejected, timings), worker_peak in results:
+        if aggregated is not None:
+            totals = aggregated if totals is None else aggregate_votes([totals, aggregated], num_candidates)
+        ballots += count
+        rejected.extend(chunk_rejected)
+        if on_chunk is not None:
+            on_chunk(count, *timings, worker_peak)
+
+    if totals is None and not rejected:
+        raise ValueError("No ballots to audit")
+    return totals, ballots, rejected
+
+
+def audit_tally(records, published, workers=None, chunk_size=1024):
+    """
+    Verify a published tally against the ballot stream.
+
+    Args:
+        records: Iterable of EncryptedVoteCast records
+        published: Output of load_published_tally
+        workers: Worker processes for aggregation
+        chunk_size: Records per work unit
+
+    Records that cannot be decoded (malformed payload, off-curve point)
+    are listed under checks.rejectedRecords and make the report invalid;
+    the remaining ballots are still aggregated and checked.
+
+    Returns:
+        Unsigned audit report dictionary
+    """
+    results = published["results"]
+    n = len(results)
+    aggregated, ballots, rejected = stream_aggregate(records, n, workers, chunk_size)
+
+    if aggregated is None:
+        aggregates_ok = [False] * n
+        aggregated = []
+    else:
+        aggregates_ok = [
+            point_eq(ct.c1, published["c1Total"][j]) and point_eq(ct.c2, published["c2Total"][j])
+            for j, ct in enumerate(aggregated)
+        ]
+    points_ok = [
+        point_eq(generator_mul(r), published["resultPoints"][j])
+        for j, r in enumerate(results)
+    ]
+    total_ok = published["totalVotes"] == ballots == sum(results)
+    points_sum_ok = point_eq(sum_points(published["resultPoints"]),
+                             generator_mul(published["totalVotes"]))
+
+    return {
+        "version": REPORT_VERSION,
+        "ballots": ballots,
+        "results": results,
+        "pk": [str(published["pk"][0]), str(published["pk"][1])],
+        "aggregated": [[str(v) for v in ct.to_flat()] for ct in aggregated],
+        "checks": {
+            "aggregates": aggregates_ok,
+            "resultPoints": points_ok,
+            "totalVotes": total_ok,
+            "resultPointsSum": points_sum_ok,
+            "rejectedCount": len(rejected),
+            "rejectedRecords": [{"position": i, "reason": reason} for i, reason in rejected],
+        },
+        "valid": (all(aggregates_ok) and all(points_ok) and total_ok and points_sum_ok
+                  and not rejected),
+    }
+
+
+def _canonical(report):
+    return json.dumps(report, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _challenge(r_point, pk, message):
+    h = hashlib.sha256()
+    h.update(f"{r_point[0]},{r_point[1]};{pk[0]},{pk[1]};".encode())
+    h.update(message)
+    return int.from_bytes(h.digest(), "big") % SUBGROUP_ORDER
+
+
+def sign_report(report, keypair):
+    """
+    Sign a report with a Schnorr signature on BabyJubJub.
+
+    The nonce is derived from the secret key and the message, so signing
+    the same report twice gives the same signature. It is reduced from a
+    512-bit SHA-512 digest so that its bias mod the group order is
+    negligible.
+
+    Returns:
+        {"report": report, "signature": {"pk", "R", "s"}}
+    """
+    message = _canonical(report)
+    nonce_seed = hashlib.sha512(f"{keypair.sk};".encode() + message).digest()
+    k = int.from_bytes(nonce_seed, "big") % (SUBGROUP_ORDER - 1) + 1
+    r_point = generator_mul(k)
+    e = _challenge(r_point, keypair.pk, message)
+    s = (k + e * keypair.sk) % SUBGROUP_ORDER
+    return {
+        "report": report,
+        "signature": {
+            "pk": [str(keypair.pk[0]), str(keypair.pk[1])],
+            "R": [str(r_point[0]), str(r_point[1])],
+            "s": str(s),
+        },
+    }
+
+
+def verify_report_signature(signed, auditor_pk):
+    """
+    Check a signed report against the expected auditor key: s*G == R + e*PK.
+
+    The key embedded in the signature must equal auditor_pk; otherwise
+    anyone could edit a report and re-sign it with their own key.
+    """
+    sig = signed["signature"]
+    pk = (int(sig["pk"][0]), int(sig["pk"][1]))
+    if not point_eq(pk, auditor_pk):
+        return False
+    r_point = (int(sig["R"][0]), int(sig["R"][1]))
+    e = _challenge(r_point, pk, _canonical(signed["report"]))
+    lhs = point_sub(generator_mul(int(sig["s"])), scalar_mul(e, pk))
+    return point_eq(lhs, r_point)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a published tally against EncryptedVoteCast events.")
+    parser.add_argument("--events", required=True, help="JSONL file of EncryptedVoteCast records")
+    parser.add_argument("--published", required=True,
+                        help="JSON with results and tally public signals (or named tally fields)")
+    parser.add_argument("--key", required=True, help="auditor key pair JSON (ElGamalKeyPair.to_dict)")
+    parser.add_argument("--output", default=None, help="write the signed report here (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="records per work unit")
+    args = parser.parse_args(argv)
+
+    with open(args.published, encoding="utf-8") as f:
+        published = load_published_tally(json.load(f))
+    with open(args.key, encoding="utf-8") as f:
+        keypair = ElGamalKeyPair.from_dict(json.load(f))
+
+    report = audit_tally(read_records(args.events), published, args.workers, args.chunk_size)
+    signed = sign_report(report, keypair)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(signed, f, indent=2)
+    else:
+        json.dump(signed, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0 if report["valid"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
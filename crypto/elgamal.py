@@ -6,6 +6,10 @@ baby-step/giant-step discrete-log solver for small plaintexts.
 
 import secrets
 import math
+from functools import lru_cache
+
+from . import tables
+from .parallel import bounded_map
 
 
 # BN254 scalar field prime (also the base field of BabyJubJub)
@@ -27,6 +31,9 @@ GENERATOR = (
 # Identity point (point at infinity for twisted Edwards curves)
 IDENTITY = (0, 1)
 
+# Everything a precomputed curve table depends on (part of its cache key)
+CURVE_PARAMS = (FIELD_PRIME, BABYJUBJUB_A, BABYJUBJUB_D, SUBGROUP_ORDER, GENERATOR)
+
 
 def _mod_inv(a, p):
     """Modular inverse using extended Euclidean algorithm."""
@@ -86,6 +93,59 @@ def point_sub(p1, p2):
     return point_add(p1, point_neg(p2))
 
 
+def _to_extended(point):
+    """Affine (x, y) to extended twisted Edwards coordinates (X, Y, Z, T)."""
+    x, y = point
+    return (x, y, 1, (x * y) % FIELD_PRIME)
+
+
+def _extended_add(e1, e2):
+    """
+    Add two points in extended coordinates without any field inversion
+    (Hisil-Wong-Carter-Dawson add-2008-hwcd, complete on BabyJubJub).
+    """
+    x1, y1, z1, t1 = e1
+    x2, y2, z2, t2 = e2
+    p = FIELD_PRIME
+
+    a = (x1 * x2) % p
+    b = (y1 * y2) % p
+    c = (BABYJUBJUB_D * t1 % p * t2) % p
+    d = (z1 * z2) % p
+    e = ((x1 + y1) * (x2 + y2) - a - b) % p
+    f = (d - c) % p
+    g = (d + c) % p
+    h = (b - BABYJUBJUB_A * a) % p
+
+    return ((e * f) % p, (g * h) % p, (f * g) % p, (e * h) % p)
+
+
+def _extended_eq(e1, e2):
+    """Whether two points in extended coordinates are equal (no inversion)."""
+    x1, y1, z1, _ = e1
+    x2, y2, z2, _ = e2
+    p = FIELD_PRIME
+    return (x1 * z2 - x2 * z1) % p == 0 and (y1 * z2 - y2 * z1) % p == 0
+
+
+def _from_extended(e):
+    """Extended coordinates back to affine (one inversion)."""
+    x, y, z, _ = e
+    z_inv = _mod_inv(z, FIELD_PRIME)
+    return ((x * z_inv) % FIELD_PRIME, (y * z_inv) % FIELD_PRIME)
+
+
+def sum_points(points):
+    """
+    Sum many points with a single field inversion.
+    Equivalent to folding point_add over the list.
+    """
+    acc = _to_extended(IDENTITY)
+    for point in points:
+        acc = _extended_add(acc, _to_extended(point))
+    return _from_extended(acc)
+
+
 def scalar_mul(scalar, point):
     """
     Scalar multiplication using double-and-add.
@@ -107,6 +167,73 @@ def scalar_mul(scalar, point):
     return result
 
 
+# Fixed-base window width for generator multiplication (table of 2^w - 1
+# points per window)
+GENERATOR_WINDOW_BITS = 4
+
+
+def _build_generator_table():
+    """
+    Precompute d * 2^(w*i) * G for every window i and digit d in [1, 2^w).
+    """
+    windows = (SUBGROUP_ORDER.bit_length() + GENERATOR_WINDOW_BITS - 1) // GENERATOR_WINDOW_BITS
+    table = []
+    base = GENERATOR
+    for _ in range(windows):
+        row = [base]
+        for _ in range(2, 1 << GENERATOR_WINDOW_BITS):
+            row.append(point_add(row[-1], base))
+        table.append(row)
+        base = point_add(row[-1], base)  # 2^w * base
+    return table
+
+
+def generator_mul(scalar):
+    """
+    Fixed-base multiplication scalar * G using a precomputed window table.
+    Costs one table addition per non-zero window and a single inversion;
+    the table is loaded or built on first use.
+    """
+    table = tables.get("generator-window")
+
+    scalar = scalar % SUBGROUP_ORDER
+    mask = (1 << GENERATOR_WINDOW_BITS) - 1
+    acc = _to_extended(IDENTITY)
+    i = 0
+    while scalar > 0:
+        digit = scalar & mask
+        if digit:
+            acc = _extended_add(acc, _to_extended(table[i][digit - 1]))
+        scalar >>= GENERATOR_WINDOW_BITS
+        i += 1
+    return _from_extended(acc)
+
+
+def _generator_table_ok(table):
+    """
+    Spot-check a loaded window table: table[i][0] == 16^i * G and
+    table[i][-1] == 15 * 16^i * G for every window i.
+    """
+    windows = (SUBGROUP_ORDER.bit_length() + GENERATOR_WINDOW_BITS - 1) // GENERATOR_WINDOW_BITS
+    digits = (1 << GENERATOR_WINDOW_BITS) - 1
+    if len(table) != windows or any(len(row) != digits for row in table):
+        return False
+    base = _to_extended(GENERATOR)
+    for row in table:
+        if not _extended_eq(base, _to_extended(row[0])):
+            return False
+        top = _extended_add(_to_extended(row[-1]), base)  # 15 * base + base
+        for _ in range(GENERATOR_WINDOW_BITS):
+            base = _extended_add(base, base)
+        if not _extended_eq(top, base):
+            return False
+    return True
+
+
+tables.register("generator-window", CURVE_PARAMS + (GENERATOR_WINDOW_BITS,),
+                _build_generator_table, _generator_table_ok)
+
+
 def is_on_curve(point):
     """Check if a point lies on the BabyJubJub curve."""
     x, y = point
@@ -126,6 +253,27 @@ def point_eq(p1, p2):
     return p1[0] == p2[0] and p1[1] == p2[1]
 
 
+def in_subgroup(point):
+    """
+    Check that a point is on BabyJubJub and in the prime-order subgroup.
+
+    Rejects off-curve points and points with a small-order (cofactor)
+    component, i.e. checks order * P == O without reducing the scalar.
+    """
+    if not is_on_curve(point):
+        return False
+    acc = _to_extended(IDENTITY)
+    current = _to_extended(point)
+    scalar = SUBGROUP_ORDER
+    while scalar > 0:
+        if scalar & 1:
+            acc = _extended_add(acc, current)
+        current = _extended_add(current, current)
+        scalar >>= 1
+    x, y, z, _ = acc
+    return x % FIELD_PRIME == 0 and (y - z) % FIELD_PRIME == 0
+
+
 class ElGamalKeyPair:
     """ElGamal key pair on BabyJubJub."""
 
@@ -194,9 +342,9 @@ def encrypt(message, pk, randomness=None):
     if randomness is None:
         randomness = secrets.randbelow(SUBGROUP_ORDER - 1) + 1
 
-    c1 = scalar_mul(randomness, GENERATOR)  # r * G
+    c1 = generator_mul(randomness)           # r * G
     r_pk = scalar_mul(randomness, pk)        # r * PK
-    m_g = scalar_mul(message, GENERATOR)     # m * G
+    m_g = generator_mul(message)             # m * G
     c2 = point_add(m_g, r_pk)               # m*G + r*PK
 
     return ElGamalCiphertext(c1, c2)
@@ -237,6 +385,50 @@ def decrypt(ciphertext, sk, max_value=10000):
     return solve_dlog(m_g, max_value)
 
 
+def _build_baby_steps(step_size):
+    """Baby steps {j*G: j} for j < step_size and the giant step -step_size*G."""
+    baby_steps = {}
+    current = IDENTITY
+    for j in range(step_size):
+        baby_steps[current] = j
+        current = point_add(current, GENERATOR)
+    giant_step = point_neg(scalar_mul(step_size, GENERATOR))
+    return baby_steps, giant_step
+
+
+# Default max_value = 10000 gives step size 101. Only this table is cached
+# on disk; other step sizes are kept in a small in-memory LRU.
+DEFAULT_BABY_STEP_SIZE = math.isqrt(10000) + 1
+_DEFAULT_BABY_STEPS = f"baby-steps-{DEFAULT_BABY_STEP_SIZE}"
+
+
+def _baby_steps_ok(table, step_size=DEFAULT_BABY_STEP_SIZE):
+    """Spot-check a loaded baby-step table at its ends and its giant step."""
+    baby_steps, giant_step = table
+    last = generator_mul(step_size - 1)
+    return (len(baby_steps) == step_size
+            and baby_steps.get(IDENTITY) == 0
+            and baby_steps.get(GENERATOR) == 1
+            and baby_steps.get(last) == step_size - 1
+            and point_eq(point_add(giant_step, point_add(last, GENERATOR)), IDENTITY))
+
+
+tables.register(_DEFAULT_BABY_STEPS, CURVE_PARAMS + (DEFAULT_BABY_STEP_SIZE,),
+                lambda: _build_baby_steps(DEFAULT_BABY_STEP_SIZE), _baby_steps_ok)
+
+
+@lru_cache(maxsize=8)
+def _transient_baby_steps(step_size):
+    return _build_baby_steps(step_size)
+
+
+def _baby_step_table(step_size):
+    """Baby-step table for a step size (disk-cached for the default only)."""
+    if step_size == DEFAULT_BABY_STEP_SIZE:
+        return tables.get(_DEFAULT_BABY_STEPS)
+    return _transient_baby_steps(step_size)
+
+
 def solve_dlog(point, max_value=10000):
     """
     Baby-step Giant-step algorithm to solve m*G = point for m.
@@ -260,16 +452,7 @@ def solve_dlog(point, max_value=10000):
         return 0
 
     step_size = int(math.isqrt(max_value)) + 1
-
-    # Baby steps: compute j*G for j = 0, 1, ..., step_size-1
-    baby_steps = {}
-    current = IDENTITY
-    for j in range(step_size):
-        baby_steps[current] = j
-        current = point_add(current, GENERATOR)
-
-    # Giant step: -step_size * G
-    giant_step = point_neg(scalar_mul(step_size, GENERATOR))
+    baby_steps, giant_step = _baby_step_table(step_size)
 
     # Giant steps: check point - i*step_size*G for i = 0, 1, ...
     current = point
@@ -297,12 +480,8 @@ def homomorphic_add(ciphertexts):
     if not ciphertexts:
         raise ValueError("Cannot add empty list of ciphertexts")
 
-    result_c1 = ciphertexts[0].c1
-    result_c2 = ciphertexts[0].c2
-
-    for ct in ciphertexts[1:]:
-        result_c1 = point_add(result_c1, ct.c1)
-        result_c2 = point_add(result_c2, ct.c2)
+    result_c1 = sum_points(ct.c1 for ct in ciphertexts)
+    result_c2 = sum_points(ct.c2 for ct in ciphertexts)
 
     return ElGamalCiphertext(result_c1, result_c2)
 
@@ -343,6 +522,58 @@ def encrypt_vote_onehot(candidate_id, num_candidates, pk, randomness_list=None):
     return ciphertexts
 
 
+def aggregate_votes(all_votes, num_candidates):
+    """
+    Aggregate one-hot vote vectors column-wise.
+
+    Args:
+        all_votes: List of vote vectors (each is a list of ElGamalCiphertext)
+        num_candidates: Number of candidates
+
+    Returns:
+        List of aggregated ElGamalCiphertext, one per candidate
+    """
+    aggregated = []
+    for j in range(num_candidates):
+        column = [vote[j] for vote in all_votes]
+        aggregated.append(homomorphic_add(column))
+    return aggregated
+
+
+def _aggregate_chunk(args):
+    chunk, num_candidates = args
+    return aggregate_votes(chunk, num_candidates)
+
+
+def aggregate_votes_parallel(all_votes, num_candidates, workers=None, chunk_size=1024):
+    """
+    Aggregate vote vectors across worker processes.
+
+    Ballots are split into chunks, each worker aggregates its chunks, and
+    the per-chunk totals are added together. Addition is associative, so
+    the result equals aggregate_votes(all_votes, num_candidates).
+
+    Args:
+        all_votes: List of vote vectors (each is a list of ElGamalCiphertext)
+        num_candidates: Number of candidates
+        workers: Number of worker processes (None = CPU count)
+        chunk_size: Ballots per work unit
+
+    Returns:
+        List of aggregated ElGamalCiphertext, one per candidate
+    """
+    if not all_votes:
+        raise ValueError("Cannot aggregate empty list of votes")
+
+    chunks = [(all_votes[i:i + chunk_size], num_candidates)
+              for i in range(0, len(all_votes), chunk_size)]
+    if len(chunks) == 1:
+        workers = 1
+    partials = list(bounded_map(_aggregate_chunk, chunks, workers))
+
+    return aggregate_votes(partials, num_candidates)
+
+
 def homomorphic_tally(all_votes, num_candidates, sk, max_votes=10000):
     """
     Tally votes using homomorphic addition and decryption.
@@ -359,11 +590,7 @@ def homomorphic_tally(all_votes, num_candidates, sk, max_votes=10000):
     if not all_votes:
         return [0] * num_candidates
 
-    # Aggregate column-wise
-    aggregated = []
-    for j in range(num_candidates):
-        column = [vote[j] for vote in all_votes]
-        aggregated.append(homomorphic_add(column))
+    aggregated = aggregate_votes(all_votes, num_candidates)
 
     # Decrypt each aggregated ciphertext
     results = []
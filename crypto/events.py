@@ -0,0 +1,63 @@
+"""Encoding and decoding of EncryptedVoteCast event records.
+
+Records are plain dictionaries shaped like the Voting contract's
+EncryptedVoteCast(voter, commitment, encryptedVote) event, one per line
+when stored as JSON Lines. The simulator produces them and the auditor
+consumes them, so both go through this module.
+"""
+
+import json
+
+from .elgamal import ElGamalCiphertext, is_on_curve
+
+
+def encrypted_vote_record(voter_index, commitment, ciphertexts):
+    """
+    Build an EncryptedVoteCast-shaped record.
+
+    encryptedVote uses the contract layout [c1x_0, c1y_0, c2x_0, c2y_0, c1x_1, ...].
+    """
+    encrypted_vote = []
+    for ct in ciphertexts:
+        encrypted_vote.extend(str(v) for v in ct.to_flat())
+    return {
+        "event": "EncryptedVoteCast",
+        "voter": f"0x{voter_index + 1:040x}",
+        "commitment": f"0x{commitment:064x}",
+        "encryptedVote": encrypted_vote,
+    }
+
+
+def record_to_ballot(record, num_candidates):
+    """
+    Reconstruct a ballot from an EncryptedVoteCast record.
+
+    Raises:
+        ValueError: If the payload length or any point is invalid
+    """
+    values = [int(v) for v in record["encryptedVote"]]
+    if len(values) != num_candidates * 4:
+        raise ValueError("invalid encrypted vote length")
+
+    ballot = []
+    for i in range(num_candidates):
+        c1 = (values[4 * i], values[4 * i + 1])
+        c2 = (values[4 * i + 2], values[4 * i + 3])
+        if not (is_on_curve(c1) and is_on_curve(c2)):
+            raise ValueError("encrypted vote point not on curve")
+        ballot.append(ElGamalCiphertext(c1, c2))
+    return ballot
+
+
+def write_record(f, record):
+    """Append one record to an open JSON Lines file."""
+    f.write(json.dumps(record, separators=(",", ":")))
+    f.write("\n")
+
+
+def read_records(path):
+    """Iterate over the records in a JSON Lines file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,89 @@
+"""Bounded fan-out of work units to worker processes.
+
+Bulk jobs (witness generation, load simulation, auditing) stream their
+input in chunks; bounded_map keeps at most two chunks per worker in flight
+so an arbitrarily long stream never piles up as pending futures.
+ProcessPoolExecutor is imported on first use to keep multiprocessing off
+the import path of the crypto package.
+"""
+
+import os
+import tracemalloc
+from collections import deque
+from functools import partial
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(fn, items, workers=None, initializer=None):
+    """
+    Apply fn to every item in worker processes, yielding results in order.
+
+    Args:
+        fn: Picklable one-argument callable
+        items: Iterable of work units (consumed lazily)
+        workers: Number of worker processes (None = CPU count, 1 = in-process)
+        initializer: Optional callable run once in each worker
+
+    Yields:
+        fn(item) for each item, in input order
+    """
+    if workers == 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    limit = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as executor:
+        in_flight = deque()
+        for item in items:
+            in_flight.append(executor.submit(fn, item))
+            if len(in_flight) >= limit:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def traced_call(fn, arg):
+    """
+    Run fn(arg) under its own tracemalloc session.
+
+    If this process is already tracing (fn runs in-process under a
+    caller's session), the session is left alone and no peak is taken.
+
+    Returns:
+        (fn(arg), peak traced bytes while fn ran, or None)
+    """
+    if tracemalloc.is_tracing():
+        return fn(arg), None
+    tracemalloc.start()
+    try:
+        result = fn(arg)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def traced_map(fn, items, workers=None):
+    """
+    bounded_map that also measures each work unit's memory in its worker.
+
+    Workers drop any tracemalloc session inherited through fork, then
+    trace every call on their own, so the peaks cover only that work unit.
+
+    Yields:
+        (fn(item), peak traced bytes in the worker, or None in-process)
+    """
+    return bounded_map(partial(traced_call, fn), items, workers, initializer=tracemalloc.stop)
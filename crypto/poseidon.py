@@ -0,0 +1,150 @@
+"""Poseidon hash over the BN254 scalar field, compatible with circomlib.
+
+Round constants and the MDS matrix are derived with the Grain LFSR from the
+Poseidon reference implementation (x^5 S-box, 8 full rounds), which is how
+circomlib's poseidon_constants were produced. Parameters for a given state
+width are generated on first use and cached through crypto.tables.
+
+The reference generator also runs an MDS security check and resamples
+insecure matrices; that check is not ported, so a width whose first
+Cauchy matrix would have been resampled would silently disagree with
+circomlib. Inputs are therefore limited to MAX_INPUTS, and every accepted
+width has a circomlib test vector in tests/test_witness.py; raise the
+limit only together with new vectors.
+"""
+
+from . import tables
+from .elgamal import FIELD_PRIME
+
+
+# Full rounds (same for every width) and partial rounds indexed by t - 2
+FULL_ROUNDS = 8
+PARTIAL_ROUNDS = [56, 57, 56, 60, 60, 63, 64, 63, 60, 66, 60, 65, 70, 60, 64, 68]
+
+# Bit length of the field elements fed to the Grain LFSR
+FIELD_BITS = 254
+
+# Largest input count with a circomlib test vector
+MAX_INPUTS = 12
+
+
+def _grain_bits(t, full_rounds, partial_rounds):
+    """Grain LFSR bit stream seeded with the Poseidon instance parameters."""
+    state = []
+
+    def push(value, width):
+        state.extend(int(b) for b in format(value, f"0{width}b"))
+
+    push(1, 2)               # prime field
+    push(0, 4)               # x^alpha S-box
+    push(FIELD_BITS, 12)
+    push(t, 12)
+    push(full_rounds, 10)
+    push(partial_rounds, 10)
+    state.extend([1] * 30)
+
+    def step():
+        bit = state[62] ^ state[51] ^ state[38] ^ state[23] ^ state[13] ^ state[0]
+        state.pop(0)
+        state.append(bit)
+        return bit
+
+    for _ in range(160):
+        step()
+
+    while True:
+        # Self-shrinking: emit the second bit of each pair whose first bit is 1
+        bit = step()
+        while bit == 0:
+            step()
+            bit = step()
+        yield step()
+
+
+def _generate_params(t):
+    """Derive (round_constants, mds) for state width t."""
+    partial_rounds = PARTIAL_ROUNDS[t - 2]
+    bits = _grain_bits(t, FULL_ROUNDS, partial_rounds)
+
+    def field_element():
+        value = 0
+        for _ in range(FIELD_BITS):
+            value = (value << 1) | next(bits)
+        return value
+
+    constants = []
+    for _ in range((FULL_ROUNDS + partial_rounds) * t):
+        value = field_element()
+        while value >= FIELD_PRIME:
+            value = field_element()
+        constants.append(value)
+
+    # Cauchy matrix M[i][j] = 1 / (x_i + y_j) over distinct x, y
+    while True:
+        xy = [field_element() % FIELD_PRIME for _ in range(2 * t)]
+        if len(set(xy)) == 2 * t:
+            break
+    mds = [[pow((xy[i] + xy[t + j]) % FIELD_PRIME, -1, FIELD_PRIME) for j in range(t)]
+           for i in range(t)]
+
+    return constants, mds
+
+
+def _params_ok(params, t):
+    """Shape and range check of a loaded parameter table for width t."""
+    constants, mds = params
+    return (len(constants) == (FULL_ROUNDS + PARTIAL_ROUNDS[t - 2]) * t
+            and len(mds) == t and all(len(row) == t for row in mds)
+            and all(0 <= c < FIELD_PRIME for c in constants)
+            and all(0 < m < FIELD_PRIME for row in mds for m in row))
+
+
+def _register_params(t):
+    """Register the parameter table for width t; returns its name."""
+    if t < 2 or t - 1 > MAX_INPUTS:
+        raise ValueError(f"Poseidon width {t} not supported")
+    name = f"poseidon-t{t}"
+    if not tables.is_registered(name):
+        tables.register(name, (FIELD_PRIME, FULL_ROUNDS, PARTIAL_ROUNDS[t - 2], t),
+                        lambda: _generate_params(t), lambda params: _params_ok(params, t))
+    return name
+
+
+def get_params(t):
+    """Return cached (round_constants, mds) for state width t."""
+    return tables.get(_register_params(t))
+
+
+# Widths used by the circuits: Poseidon(2) commitments and Poseidon(8)
+# ciphertext hashes for two candidates
+_register_params(3)
+_register_params(9)
+
+
+def poseidon(inputs):
+    """
+    Poseidon hash of 1-12 field elements, matching circomlib's Poseidon(n).
+
+    Args:
+        inputs: List of integers (reduced mod FIELD_PRIME)
+
+    Returns:
+        Integer hash in [0, FIELD_PRIME)
+    """
+    t = len(inputs) + 1
+    constants, mds = get_params(t)
+    partial_rounds = PARTIAL_ROUNDS[t - 2]
+    half_full = FULL_ROUNDS // 2
+    p = FIELD_PRIME
+
+    state = [0] + [x % p for x in inputs]
+    for r in range(FULL_ROUNDS + partial_rounds):
+        offset = r * t
+        state = [(x + constants[offset + i]) % p for i, x in enumerate(state)]
+        if r < half_full or r >= half_full + partial_rounds:
+            state = [pow(x, 5, p) for x in state]
+        else:
+            state[0] = pow(state[0], 5, p)
+        state = [sum(row[j] * state[j] for j in range(t)) % p for row in mds]
+
+    return state[0]
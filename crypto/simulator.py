@@ -0,0 +1,347 @@
+"""Election-day load simulator and end-to-end throughput harness.
+
+Generates N voters with a configurable candidate distribution, encrypts
+their one-hot ballots in parallel, and emits EncryptedVoteCast-shaped
+records to a JSON Lines file or a mock chain. The records are then
+streamed through ingestion + aggregation (in bounded chunks, the same path
+the auditor uses) and decryption, and each stage reports throughput and
+latency percentiles.
+
+Ingestion and aggregation run fused in one pass, timed per chunk inside
+the workers; their "seconds" is busy time summed over chunks rather than
+wall-clock time.
+
+With --trace-memory the run instead reports memory per stage: the
+tracemalloc peak of this process during the stage and the largest
+per-chunk tracemalloc peak inside a worker. Tracing slows Python code many
+times over, so a traced run reports no timings; run it separately.
+
+Usage:
+    python -m crypto.simulator --voters 1000 --distribution 0.6,0.4
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from .audit import stream_aggregate
+from .elgamal import ElGamalKeyPair, encrypt_vote_onehot, decrypt
+from .events import encrypted_vote_record, write_record, read_records
+from .parallel import bounded_map, traced_map, chunked
+from .witness import random_salt, compute_commitment
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class StageReport:
+    """Timing and memory figures for one pipeline stage."""
+
+    def __init__(self, name, count, seconds, latencies, peak_traced=None, worker_peak_traced=None):
+        self.name = name
+        self.count = count                            # Items processed
+        self.seconds = seconds                        # Time for the stage, None if traced
+        self.latencies = latencies                    # Per work-unit latency in seconds
+        self.peak_traced = peak_traced                # tracemalloc peak in this process (bytes)
+        self.worker_peak_traced = worker_peak_traced  # Largest per-chunk tracemalloc peak in a worker (bytes)
+
+    @property
+    def throughput(self):
+        """Items per second, or None for a traced run."""
+        if self.seconds is None:
+            return None
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self):
+        """Serialize report to dictionary (latencies in milliseconds)."""
+        data = {
+            "stage": self.name,
+            "count": self.count,
+            "seconds": None,
+            "throughputPerSec": None,
+            "latencyMs": None,
+            "peakTracedBytes": self.peak_traced,
+            "workerPeakTracedBytes": self.worker_peak_traced,
+        }
+        if self.seconds is not None:
+            ordered = sorted(self.latencies)
+            data["seconds"] = round(self.seconds, 6)
+            data["throughputPerSec"] = round(self.throughput, 3)
+            data["latencyMs"] = {
+                "p50": round(_percentile(ordered, 50) * 1000, 3),
+                "p95": round(_percentile(ordered, 95) * 1000, 3),
+                "p99": round(_percentile(ordered, 99) * 1000, 3),
+                "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+            }
+        return data
+
+
+class MockChain:
+    """
+    Stand-in for the Voting contract's event log.
+
+    Records are buffered in memory and events() consumes them, dropping
+    each record once it has been handed out. Pass spool_path to append
+    them to a JSON Lines file instead, so large runs stay on disk.
+    """
+
+    def __init__(self, spool_path=None):
+        self.count = 0
+        self._records = deque()
+        self._spool = FileSink(spool_path) if spool_path is not None else None
+
+    def emit(self, record):
+        if self._spool is not None:
+            self._spool.emit(record)
+        else:
+            self._records.append(record)
+        self.count += 1
+
+    def events(self):
+        if self._spool is not None:
+            yield from self._spool.events()
+            return
+        while self._records:
+            yield self._records.popleft()
+
+    def __len__(self):
+        return self.count
+
+
+class FileSink:
+    """Append EncryptedVoteCast records to a JSON Lines file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8")
+
+    def emit(self, record):
+        write_record(self._file, record)
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def events(self):
+        self.close()
+        return read_records(self.path)
+
+    def __len__(self):
+        return self.count
+
+
+def sample_candidates(num_voters, distribution, seed=None):
+    """
+    Draw one candidate per voter.
+
+    Args:
+        num_voters: Number of voters
+        distribution: Relative weight per candidate
+        seed: Optional RNG seed for reproducible runs
+
+    Returns:
+        List of candidate indices
+    """
+    if not distribution or any(w < 0 for w in distribution) or sum(distribution) <= 0:
+        raise ValueError("distribution must be non-negative weights with a positive sum")
+    rng = random.Random(seed)
+    return rng.choices(range(len(distribution)), weights=distribution, k=num_voters)
+
+
+def _candidate_stream(num_voters, distribution, seed=None, chunk_size=1024):
+    """
+    Yield the same draw as sample_candidates without materializing it.
+
+    random.choices consumes one random() per pick, so drawing in chunks
+    from one generator reproduces the single-call sequence.
+    """
+    sample_candidates(0, distribution)  # Validate weights
+    rng = random.Random(seed)
+    population = range(len(distribution))
+    remaining = num_voters
+    while remaining > 0:
+        k = min(chunk_size, remaining)
+        yield from rng.choices(population, weights=distribution, k=k)
+        remaining -= k
+
+
+def _encrypt_worker(args):
+    voter_index, candidate_id, num_candidates, pk = args
+    start = time.perf_counter()
+    ciphertexts = encrypt_vote_onehot(candidate_id, num_candidates, pk)
+    commitment = compute_commitment(candidate_id, random_salt())
+    record = encrypted_vote_record(voter_index, commitment, ciphertexts)
+    return record, time.perf_counter() - start
+
+
+def _encrypt_chunk(jobs):
+    return [_encrypt_worker(job) for job in jobs]
+
+
+def _measure(fn, trace_memory):
+    """
+    Run fn() as one stage.
+
+    Returns:
+        (result, seconds, peak traced bytes): seconds is None when traced,
+        since tracing distorts timings; the peak is None when not traced
+    """
+    if not trace_memory:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start, None
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started:
+            tracemalloc.stop()
+    return result, None, peak
+
+
+def _max_peak(current, peak):
+    return peak if current is None else max(current, peak or 0)
+
+
+def run_simulation(num_voters, distribution, keypair=None, sink=None,
+                   workers=None, chunk_size=1024, seed=None, trace_memory=False):
+    """
+    Run the full encrypt -> ingest/aggregate -> decrypt pipeline.
+
+    Ballots are encrypted in chunks through parallel.bounded_map, and
+    ingestion is fused with aggregation through audit.stream_aggregate, so
+    no stage holds every ballot in memory.
+
+    Args:
+        num_voters: Number of simulated voters (>= 1)
+        distribution: Relative weight per candidate
+        keypair: ElGamalKeyPair (a fresh one is generated if omitted)
+        sink: MockChain or FileSink receiving the records
+        workers: Worker processes (1 runs every stage in-process)
+        chunk_size: Ballots per work unit
+        seed: Optional RNG seed for the candidate draw
+        trace_memory: Report per-stage memory instead of timings
+
+    Returns:
+        Dictionary with per-stage reports, the tally and the expected tally
+    """
+    if num_voters < 1:
+        raise ValueError("num_voters must be at least 1")
+
+    num_candidates = len(distribution)
+    keypair = keypair or ElGamalKeyPair.generate()
+    sink = sink if sink is not None else MockChain()
+    expected = [0] * num_candidates
+    reports = []
+
+    def jobs():
+        for i, cid in enumerate(_candidate_stream(num_voters, distribution, seed, chunk_size)):
+            expected[cid] += 1
+            yield i, cid, num_candidates, keypair.pk
+
+    encrypt_latencies = []
+    encrypt_worker_peak = None
+
+    def encrypt_stage():
+        nonlocal encrypt_worker_peak
+        chunks = chunked(jobs(), chunk_size)
+        if trace_memory:
+            results = traced_map(_encrypt_chunk, chunks, workers)
+        else:
+            results = ((result, None) for result in bounded_map(_encrypt_chunk, chunks, workers))
+        for chunk_results, worker_peak in results:
+            encrypt_worker_peak = _max_peak(encrypt_worker_peak, worker_peak)
+            for record, latency in chunk_results:
+                sink.emit(record)
+                encrypt_latencies.append(latency)
+
+    _, seconds, peak = _measure(encrypt_stage, trace_memory)
+    reports.append(StageReport("encrypt", len(encrypt_latencies), seconds, encrypt_latencies,
+                               peak, encrypt_worker_peak))
+
+    ingest_latencies = []
+    aggregate_latencies = []
+    aggregate_worker_peak = None
+
+    def on_chunk(count, ingest_seconds, aggregate_seconds, worker_peak):
+        nonlocal aggregate_worker_peak
+        ingest_latencies.append(ingest_seconds)
+        aggregate_latencies.append(aggregate_seconds)
+        aggregate_worker_peak = _max_peak(aggregate_worker_peak, worker_peak)
+
+    def aggregate_stage():
+        return stream_aggregate(sink.events(), num_candidates, workers, chunk_size,
+                                on_chunk=on_chunk, trace_memory=trace_memory)
+
+    (aggregated, ballots, _), seconds, peak = _measure(aggregate_stage, trace_memory)
+    # Fused pass: each phase reports its busy time summed over chunks
+    for name, latencies in (("ingest", ingest_latencies), ("aggregate", aggregate_latencies)):
+        busy = None if seconds is None else sum(latencies)
+        reports.append(StageReport(name, ballots, busy, latencies, peak, aggregate_worker_peak))
+
+    decrypt_latencies = []
+
+    def decrypt_stage():
+        results = []
+        for ct in aggregated:
+            start = time.perf_counter()
+            results.append(decrypt(ct, keypair.sk, num_voters))
+            decrypt_latencies.append(time.perf_counter() - start)
+        return results
+
+    tally, seconds, peak = _measure(decrypt_stage, trace_memory)
+    reports.append(StageReport("decrypt", len(tally), seconds, decrypt_latencies, peak))
+
+    return {
+        "voters": num_voters,
+        "candidates": num_candidates,
+        "stages": [r.to_dict() for r in reports],
+        "tally": tally,
+        "expected": expected,
+        "tallyMatches": tally == expected,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate an election and report throughput per stage.")
+    parser.add_argument("--voters", type=int, default=100, help="number of voters")
+    parser.add_argument("--distribution", default="0.5,0.5",
+                        help="comma-separated candidate weights (default: 0.5,0.5)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="ballots per work unit")
+    parser.add_argument("--events", default=None,
+                        help="write EncryptedVoteCast records to this JSONL file instead of memory")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for the candidate draw")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="report per-stage tracemalloc peaks instead of timings")
+    args = parser.parse_args(argv)
+
+    distribution = [float(w) for w in args.distribution.split(",")]
+    sink = FileSink(args.events) if args.events else MockChain()
+    report = run_simulation(args.voters, distribution, sink=sink, workers=args.workers,
+                            chunk_size=args.chunk_size, seed=args.seed,
+                            trace_memory=args.trace_memory)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["tallyMatches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Lazily built precomputed tables with an on-disk cache.
+
+Heavy tables (generator window table, default baby steps, Poseidon
+constants) are registered here by the modules that use them and built on
+first use. A built table is kept in memory and serialized with marshal
+under a file name keyed by the table's parameters (curve constants,
+widths), the table format version and the Python version, so later
+processes load it from disk instead of rebuilding it.
+
+Cache files carry a SHA-256 digest of their payload, and owners can
+register a validator that spot-checks a loaded table; a file that fails
+either check is rebuilt and overwritten.
+
+The cache lives in $EVOTING_TABLE_CACHE, or ~/.cache/evoting by default;
+set EVOTING_TABLE_CACHE to an empty string to disable it.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+
+
+# Bump when the layout of any cached table changes
+TABLE_VERSION = 2
+
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+_BUILDERS = {}
+_TABLES = {}
+_LOCK = threading.RLock()
+
+
+def cache_dir():
+    """Directory for serialized tables, or None if caching is disabled."""
+    value = os.environ.get("EVOTING_TABLE_CACHE")
+    if value is None:
+        return Path.home() / ".cache" / "evoting"
+    return Path(value) if value else None
+
+
+def _cache_path(name, params):
+    key = repr((TABLE_VERSION, sys.version_info[:2], name, params)).encode()
+    digest = hashlib.sha256(key).hexdigest()[:16]
+    directory = cache_dir()
+    return directory / f"{name}-{digest}.marshal" if directory else None
+
+
+def _load(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    digest, payload = data[:_DIGEST_SIZE], data[_DIGEST_SIZE:]
+    if hashlib.sha256(payload).digest() != digest:
+        return None
+    try:
+        return marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _is_valid(validate, table):
+    try:
+        return bool(validate(table))
+    except (LookupError, TypeError, ValueError):
+        return False  # Wrong shape for this table
+
+
+def _store(path, table):
+    """Write atomically so concurrent workers never read a partial file."""
+    import tempfile
+
+    payload = marshal.dumps(table)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(hashlib.sha256(payload).digest())
+            f.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # The cache is an optimization; a read-only home is fine
+
+
+def register(name, params, builder, validate=None):
+    """
+    Register a table builder.
+
+    Args:
+        name: Table name, unique per parameter set
+        params: Tuple of everything the table depends on (part of the cache key)
+        builder: Zero-argument callable returning a marshal-able table
+        validate: Optional callable checking a table loaded from disk
+    """
+    _BUILDERS[name] = (params, builder, validate)
+
+
+def get(name):
+    """
+    Return a registered table, loading it from disk or building it on first use.
+
+    Raises:
+        KeyError: If no table with this name is registered
+    """
+    table = _TABLES.get(name)
+    if table is not None:
+        return table
+
+    with _LOCK:
+        table = _TABLES.get(name)
+        if table is not None:
+            return table
+
+        params, builder, validate = _BUILDERS[name]
+        path = _cache_path(name, params)
+        table = _load(path) if path is not None else None
+        if table is not None and validate is not None and not _is_valid(validate, table):
+            table = None
+        if table is None:
+            table = builder()
+            if path is not None:
+                _store(path, table)
+        _TABLES[name] = table
+        return table
+
+
+def is_registered(name):
+    """Whether a builder is registered under this name."""
+    return name in _BUILDERS
+
+
+def is_loaded(name):
+    """Whether a table is already in memory."""
+    return name in _TABLES
+
+
+def clear(name=None):
+    """Drop one or all in-memory tables (the on-disk cache is left alone)."""
+    with _LOCK:
+        if name is None:
+            _TABLES.clear()
+        else:
+            _TABLES.pop(name, None)
+
+
+def warm_up(names=None):
+    """
+    Load or build tables ahead of first use.
+
+    Importing the crypto modules that own the default tables registers
+    them, so this can run in a background thread at server start.
+
+    Args:
+        names: Table names to warm (default: every registered table)
+
+    Returns:
+        List of table names now in memory
+    """
+    # Owners register their tables at import time
+    from . import elgamal, poseidon  # noqa: F401
+
+    if names is None:
+        names = list(_BUILDERS)
+    for name in names:
+        get(name)
+    return list(names)
@@ -0,0 +1,481 @@
+"""Threshold ElGamal on BabyJubJub: distributed key generation and
+verifiable partial decryption spread across trustees.
+
+Key generation follows Joint-Feldman: every trustee deals a random
+polynomial of degree threshold-1, publishes coefficient commitments and
+sends one evaluation to each peer. A trustee's key share is the sum of the
+evaluations it received (combine_sub_shares), and the election public key
+is the sum of the constant-term commitments (joint_key), so no single
+party ever holds the secret key. Each step runs on the trustee's own
+machine; distributed_keygen chains them in one process for tests only.
+
+At tally time each trustee computes sk_i * C1_j for every aggregated
+ciphertext together with one batched Chaum-Pedersen proof covering the
+whole batch. Any `threshold` valid partials are combined by Lagrange
+interpolation in the exponent and the message point is handed to
+solve_dlog.
+"""
+
+import hashlib
+import secrets
+
+from .elgamal import (
+    SUBGROUP_ORDER, GENERATOR, IDENTITY,
+    point_add, point_sub, scalar_mul, point_eq, in_subgroup,
+    aggregate_votes, solve_dlog,
+)
+
+
+# Bit length of the random weights used to fold a batch into one proof
+BATCH_WEIGHT_BITS = 128
+
+
+def _random_scalar():
+    """Random scalar in [1, order-1]."""
+    return secrets.randbelow(SUBGROUP_ORDER - 1) + 1
+
+
+def _hash_to_int(*values):
+    """SHA-256 over the decimal encoding of ints and points."""
+    h = hashlib.sha256()
+    for value in values:
+        if isinstance(value, tuple):
+            h.update(f"{value[0]},{value[1]};".encode())
+        else:
+            h.update(f"{value};".encode())
+    return int.from_bytes(h.digest(), "big")
+
+
+def _eval_poly(coeffs, x):
+    """Evaluate a polynomial (lowest degree first) at x mod the group order."""
+    result = 0
+    for coeff in reversed(coeffs):
+        result = (result * x + coeff) % SUBGROUP_ORDER
+    return result
+
+
+def _eval_commitments(commitments, x):
+    """Evaluate Feldman commitments in the exponent: sum_k x^k * A_k."""
+    result = IDENTITY
+    power = 1
+    for commitment in commitments:
+        result = point_add(result, scalar_mul(power, commitment))
+        power = (power * x) % SUBGROUP_ORDER
+    return result
+
+
+def _linear_combination(weights, points):
+    """Compute sum_j w_j * P_j."""
+    result = IDENTITY
+    for w, p in zip(weights, points):
+        result = point_add(result, scalar_mul(w, p))
+    return result
+
+
+def lagrange_coefficient(index, indices):
+    """
+    Lagrange basis coefficient at x = 0 for trustee `index`.
+
+    Args:
+        index: Trustee index (1-based) whose coefficient is wanted
+        indices: Indices of all trustees taking part in the combination
+
+    Returns:
+        Scalar lambda_i mod the subgroup order
+    """
+    num = 1
+    den = 1
+    for j in indices:
+        if j == index:
+            continue
+        num = (num * j) % SUBGROUP_ORDER
+        den = (den * (j - index)) % SUBGROUP_ORDER
+    return (num * pow(den, -1, SUBGROUP_ORDER)) % SUBGROUP_ORDER
+
+
+class TrusteeShare:
+    """One trustee's share x_i of the election secret key."""
+
+    def __init__(self, index, share):
+        self.index = index  # Trustee index (1-based evaluation point)
+        self.share = share  # Secret key share (scalar)
+
+    @property
+    def verification_key(self):
+        """Public verification key x_i * G."""
+        return scalar_mul(self.share, GENERATOR)
+
+    def to_dict(self):
+        """Serialize share to dictionary."""
+        return {"index": self.index, "share": str(self.share)}
+
+    @staticmethod
+    def from_dict(data):
+        """Deserialize share from dictionary."""
+        return TrusteeShare(int(data["index"]), int(data["share"]))
+
+
+class ThresholdKey:
+    """Public side of a threshold key: election PK and per-trustee verification keys."""
+
+    def __init__(self, pk, threshold, verification_keys):
+        self.pk = pk                                # Election public key (point)
+        self.threshold = threshold                  # Shares needed to decrypt
+        self.verification_keys = verification_keys  # {index: x_i * G}
+
+    def to_dict(self):
+        """Serialize public key material to dictionary."""
+        return {
+            "pk": [str(self.pk[0]), str(self.pk[1])],
+            "threshold": self.threshold,
+            "verificationKeys": {
+                str(i): [str(vk[0]), str(vk[1])]
+                for i, vk in self.verification_keys.items()
+            },
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Deserialize public key material from dictionary."""
+        pk = (int(data["pk"][0]), int(data["pk"][1]))
+        verification_keys = {
+            int(i): (int(vk[0]), int(vk[1]))
+            for i, vk in data["verificationKeys"].items()
+        }
+        return ThresholdKey(pk, int(data["threshold"]), verification_keys)
+
+
+def deal_polynomial(threshold, num_trustees):
+    """
+    Run one trustee's dealing round of the Joint-Feldman DKG.
+
+    Args:
+        threshold: Number of shares required to decrypt
+        num_trustees: Total number of trustees
+
+    Returns:
+        (commitments, sub_shares) where commitments are a_k * G for each
+        coefficient and sub_shares maps trustee index to f(index)
+    """
+    coeffs = [_random_scalar() for _ in range(threshold)]
+    commitments = [scalar_mul(a, GENERATOR) for a in coeffs]
+    sub_shares = {i: _eval_poly(coeffs, i) for i in range(1, num_trustees + 1)}
+    return commitments, sub_shares
+
+
+def verify_sub_share(index, sub_share, commitments):
+    """Feldman check: f(index) * G == sum_k index^k * A_k."""
+    expected = _eval_commitments(commitments, index)
+    return point_eq(scalar_mul(sub_share, GENERATOR), expected)
+
+
+def check_commitments(dealer, commitments, threshold):
+    """
+    Check a dealer's published commitments before they are used.
+
+    A dealing of the wrong degree passes every Feldman check yet leaves
+    shares that no longer match the joint verification keys, so the length
+    must be exactly `threshold`; every commitment must be in the subgroup.
+
+    Raises:
+        ValueError: Naming the dealer if the commitments are malformed
+    """
+    if len(commitments) != threshold:
+        raise ValueError(
+            f"Dealer {dealer} published {len(commitments)} commitments, expected {threshold}"
+        )
+    if not all(in_subgroup(c) for c in commitments):
+        raise ValueError(f"Dealer {dealer} published a commitment outside the subgroup")
+
+
+def combine_sub_shares(index, received, dealer_commitments, threshold):
+    """
+    Trustee side of the DKG: verify every received sub-share and sum them.
+
+    Args:
+        index: This trustee's index
+        received: {dealer index: f_dealer(index)} sent privately to this trustee
+        dealer_commitments: {dealer index: commitments} published by each dealer
+        threshold: Number of trustees required to decrypt
+
+    Returns:
+        TrusteeShare for this trustee
+
+    Raises:
+        ValueError: If a dealer's commitments are malformed, or a sub-share
+            is missing or fails its Feldman check
+    """
+    total = 0
+    for dealer, commitments in dealer_commitments.items():
+        check_commitments(dealer, commitments, threshold)
+        if dealer not in received:
+            raise ValueError(f"Missing sub-share from dealer {dealer} to trustee {index}")
+        if not verify_sub_share(index, received[dealer], commitments):
+            raise ValueError(f"Sub-share from dealer {dealer} to trustee {index} is invalid")
+        total = (total + received[dealer]) % SUBGROUP_ORDER
+    return TrusteeShare(index, total)
+
+
+def joint_key(dealer_commitments, threshold, num_trustees):
+    """
+    Public side of the DKG: derive the election key from published commitments.
+
+    Anyone can run this; it needs no secret material.
+
+    Args:
+        dealer_commitments: {dealer index: commitments} published by each dealer
+        threshold: Number of trustees required to decrypt
+        num_trustees: Total number of trustees
+
+    Returns:
+        ThresholdKey with the election PK and per-trustee verification keys
+
+    Raises:
+        ValueError: If a dealer's commitments are malformed
+    """
+    for dealer, commitments in dealer_commitments.items():
+        check_commitments(dealer, commitments, threshold)
+
+    joint = []
+    for k in range(threshold):
+        acc = IDENTITY
+        for commitments in dealer_commitments.values():
+            acc = point_add(acc, commitments[k])
+        joint.append(acc)
+
+    verification_keys = {i: _eval_commitments(joint, i) for i in range(1, num_trustees + 1)}
+    return ThresholdKey(joint[0], threshold, verification_keys)
+
+
+def distributed_keygen(num_trustees, threshold):
+    """
+    Run the whole Joint-Feldman DKG in this process (test driver).
+
+    The calling process sees every dealing and could rebuild the secret
+    key, so real deployments run deal_polynomial, combine_sub_shares and
+    joint_key on each trustee's own machine instead.
+
+    Args:
+        num_trustees: Total number of trustees
+        threshold: Number of trustees required to decrypt
+
+    Returns:
+        (ThresholdKey, list of TrusteeShare)
+
+    Raises:
+        ValueError: If the parameters are invalid or a dealing fails its check
+    """
+    if threshold < 1 or threshold > num_trustees:
+        raise ValueError(f"threshold {threshold} out of range [1, {num_trustees}]")
+
+    dealings = {
+        dealer: deal_polynomial(threshold, num_trustees)
+        for dealer in range(1, num_trustees + 1)
+    }
+    commitments = {dealer: c for dealer, (c, _) in dealings.items()}
+
+    shares = [
+        combine_sub_shares(i, {dealer: sub[i] for dealer, (_, sub) in dealings.items()},
+                           commitments, threshold)
+        for i in range(1, num_trustees + 1)
+    ]
+    return joint_key(commitments, threshold, num_trustees), shares
+
+
+class PartialDecryption:
+    """A trustee's partial decryptions sk_i * C1_j with one batched DLEQ proof."""
+
+    def __init__(self, index, points, challenge, response):
+        self.index = index          # Trustee index
+        self.points = points        # [sk_i * C1_j for each ciphertext]
+        self.challenge = challenge  # Fiat-Shamir challenge c
+        self.response = response    # s = k + c * sk_i
+
+    def to_dict(self):
+        """Serialize partial decryption to dictionary."""
+        return {
+            "index": self.index,
+            "points": [[str(p[0]), str(p[1])] for p in self.points],
+            "challenge": str(self.challenge),
+            "response": str(self.response),
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Deserialize partial decryption from dictionary."""
+        points = [(int(p[0]), int(p[1])) for p in data["points"]]
+        return PartialDecryption(
+            int(data["index"]), points, int(data["challenge"]), int(data["response"])
+        )
+
+
+def _batch_bases(verification_key, c1_points, partial_points):
+    """
+    Fold a batch into a single DLEQ statement.
+
+    The weights are derived from the whole batch, so a single proof that
+    log_G(vk) == log_B(D) with B = sum w_j C1_j and D = sum w_j D_j binds
+    every D_j = sk_i * C1_j except with negligible probability.
+    """
+    seed = _hash_to_int("batch", verification_key, *c1_points, *partial_points)
+    mask = (1 << BATCH_WEIGHT_BITS) - 1
+    weights = [_hash_to_int(seed, j) & mask for j in range(len(c1_points))]
+    return (_linear_combination(weights, c1_points),
+            _linear_combination(weights, partial_points))
+
+
+def partial_decrypt(share, ciphertexts):
+    """
+    Compute one trustee's partial decryptions for a batch of ciphertexts.
+
+    Args:
+        share: TrusteeShare
+        ciphertexts: List of (aggregated) ElGamalCiphertext
+
+    Returns:
+        PartialDecryption carrying sk_i * C1_j and a batched proof of correctness
+    """
+    c1_points = [ct.c1 for ct in ciphertexts]
+    points = [scalar_mul(share.share, c1) for c1 in c1_points]
+    vk = share.verification_key
+
+    base, target = _batch_bases(vk, c1_points, points)
+    k = _random_scalar()
+    a1 = scalar_mul(k, GENERATOR)
+    a2 = scalar_mul(k, base)
+    challenge = _hash_to_int("dleq", vk, base, target, a1, a2) % SUBGROUP_ORDER
+    response = (k + challenge * share.share) % SUBGROUP_ORDER
+
+    return PartialDecryption(share.index, points, challenge, response)
+
+
+def verify_partial_decryption(partial, ciphertexts, verification_key):
+    """
+    Check a trustee's batched DLEQ proof.
+
+    Every partial point must be in the prime-order subgroup. Beyond that
+    the check costs two scalar multiplications per ciphertext plus four,
+    regardless of how the batch was produced.
+
+    Returns:
+        True if every partial decryption in the batch is correct
+    """
+    if len(partial.points) != len(ciphertexts):
+        return False
+    # Off-curve or small-order points could pass the proof with probability 1/8
+    if not all(in_subgroup(p) for p in partial.points):
+        return False
+
+    c1_points = [ct.c1 for ct in ciphertexts]
+    base, target = _batch_bases(verification_key, c1_points, partial.points)
+
+    c, s = partial.challenge, partial.response
+    a1 = point_sub(scalar_mul(s, GENERATOR), scalar_mul(c, verification_key))
+    a2 = point_sub(scalar_mul(s, base), scalar_mul(c, target))
+    expected = _hash_to_int("dleq", verification_key, base, target, a1, a2) % SUBGROUP_ORDER
+    return c == expected
+
+
+def combine_partial_decryptions(ciphertexts, partials, key, max_value=10000):
+    """
+    Verify partial decryptions and combine them into plaintexts.
+
+    Partials with an invalid proof or an unknown index are discarded; the
+    first `key.threshold` valid ones are interpolated in the exponent:
+      sk * C1_j = sum_i lambda_i * (sk_i * C1_j)
+      m_j * G   = C2_j - sk * C1_j
+
+    Args:
+        ciphertexts: List of ElGamalCiphertext that were partially decrypted
+        partials: List of PartialDecryption from distinct trustees
+        key: ThresholdKey
+        max_value: Maximum expected message value
+
+    Returns:
+        List of integer messages, one per ciphertext
+
+    Raises:
+        ValueError: If fewer than `key.threshold` valid partials are available
+    """
+    valid = []
+    seen = set()
+    for partial in partials:
+        if partial.index in seen or partial.index not in key.verification_keys:
+            continue
+        if verify_partial_decryption(partial, ciphertexts, key.verification_keys[partial.index]):
+            valid.append(partial)
+            seen.add(partial.index)
+        if len(valid) == key.threshold:
+            break
+
+    if len(valid) < key.threshold:
+        raise ValueError(
+            f"Need {key.threshold} valid partial decryptions, got {len(valid)}"
+        )
+
+    indices = [p.index for p in valid]
+    lambdas = [lagrange_coefficient(i, indices) for i in indices]
+
+    results = []
+    for j, ct in enumerate(ciphertexts):
+        sk_c1 = _linear_combination(lambdas, [p.points[j] for p in valid])
+        m_g = point_sub(ct.c2, sk_c1)
+        results.append(solve_dlog(m_g, max_value))
+    return results
+
+
+class LocalTrusteePool:
+    """
+    Local multi-process stand-in for trustees running on separate machines.
+
+    Each share is handed to a worker process that computes its partial
+    decryptions; only PartialDecryption objects travel back, mirroring
+    what remote trustees would publish.
+    """
+
+    def __init__(self, shares, max_workers=None):
+        self.shares = list(shares)
+        self.max_workers = max_workers or len(self.shares)
+        self._executor = None
+
+    def __enter__(self):
+        # Imported on first use, like parallel.bounded_map, to keep
+        # multiprocessing off the import path
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown()
+        self._executor = None
+
+    def partial_decrypt_all(self, ciphertexts):
+        """Run partial_decrypt for every trustee in parallel."""
+        if self._executor is None:
+            raise RuntimeError("LocalTrusteePool must be used as a context manager")
+        futures = [self._executor.submit(partial_decrypt, share, ciphertexts)
+                   for share in self.shares]
+        return [f.result() for f in futures]
+
+
+def threshold_tally(all_votes, num_candidates, key, pool, max_votes=10000):
+    """
+    Tally votes with threshold decryption.
+
+    Args:
+        all_votes: List of vote vectors (each is a list of ElGamalCiphertext)
+        num_candidates: Number of candidates
+        key: ThresholdKey the votes were encrypted under
+        pool: LocalTrusteePool (or any object with partial_decrypt_all)
+        max_votes: Maximum expected votes per candidate
+
+    Returns:
+        List of vote counts per candidate
+    """
+    if not all_votes:
+        return [0] * num_candidates
+
+    aggregated = aggregate_votes(all_votes, num_candidates)
+    partials = pool.partial_decrypt_all(aggregated)
+    return combine_partial_decryptions(aggregated, partials, key, max_votes)
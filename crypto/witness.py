@@ -0,0 +1,207 @@
+"""Witness inputs for the vote and tally circuits, built in bulk.
+
+Mirrors prepareVoteWitness / prepareTallyWitness in frontend/lib/elgamal.js
+so that inputs for circuits/vote_proof.circom and circuits/tally_proof.circom
+can be produced server-side. Public signal lists follow the order the
+circuits declare them, which is what Voting.castVote (4 signals) and
+Voting.updateTallyResults (15 signals for N = 2) expect.
+"""
+
+import json
+import secrets
+
+from .elgamal import (
+    SUBGROUP_ORDER,
+    scalar_mul, point_sub,
+    encrypt_vote_onehot, aggregate_votes,
+)
+from .parallel import bounded_map, chunked
+from .poseidon import poseidon
+
+
+def random_salt():
+    """Random salt in [1, order-1], same range as randomFieldElement() in JS."""
+    return secrets.randbelow(SUBGROUP_ORDER - 1) + 1
+
+
+def compute_commitment(candidate_id, salt):
+    """Compute commitment = Poseidon(candidateId, salt)."""
+    return poseidon([candidate_id, salt])
+
+
+def compute_ciphertext_hash(ciphertexts):
+    """Compute ciphertext hash = Poseidon(c1x[0], c1y[0], c2x[0], c2y[0], ...)."""
+    inputs = []
+    for ct in ciphertexts:
+        inputs.extend(ct.to_flat())
+    return poseidon(inputs)
+
+
+def prepare_vote_witness(candidate_id, salt, pk, ciphertexts, randomness):
+    """
+    Prepare witness inputs for the vote_proof circuit.
+
+    Args:
+        candidate_id: Index of chosen candidate (0-based)
+        salt: Commitment salt
+        pk: ElGamal public key point
+        ciphertexts: One-hot ballot (list of ElGamalCiphertext)
+        randomness: Encryption randomness per position
+
+    Returns:
+        Circuit input dictionary (all values as decimal strings)
+    """
+    return {
+        "commitment": str(compute_commitment(candidate_id, salt)),
+        "ciphertextHash": str(compute_ciphertext_hash(ciphertexts)),
+        "pkX": str(pk[0]),
+        "pkY": str(pk[1]),
+        "candidateId": str(candidate_id),
+        "salt": str(salt),
+        "r": [str(r) for r in randomness],
+        "c1X": [str(ct.c1[0]) for ct in ciphertexts],
+        "c1Y": [str(ct.c1[1]) for ct in ciphertexts],
+        "c2X": [str(ct.c2[0]) for ct in ciphertexts],
+        "c2Y": [str(ct.c2[1]) for ct in ciphertexts],
+    }
+
+
+def vote_public_signals(witness):
+    """Public signals of a vote witness: [commitment, ciphertextHash, pkX, pkY]."""
+    return [witness["commitment"], witness["ciphertextHash"], witness["pkX"], witness["pkY"]]
+
+
+def prepare_tally_witness(sk, pk, aggregated, result_points, total_votes):
+    """
+    Prepare witness inputs for the tally_proof circuit.
+
+    Args:
+        sk: Admin secret key
+        pk: ElGamal public key point
+        aggregated: Aggregated ElGamalCiphertext per candidate
+        result_points: results[j] * G per candidate
+        total_votes: Total number of ballots
+
+    Returns:
+        Circuit input dictionary (all values as decimal strings)
+    """
+    return {
+        "pkX": str(pk[0]),
+        "pkY": str(pk[1]),
+        "c1TotalX": [str(ct.c1[0]) for ct in aggregated],
+        "c1TotalY": [str(ct.c1[1]) for ct in aggregated],
+        "c2TotalX": [str(ct.c2[0]) for ct in aggregated],
+        "c2TotalY": [str(ct.c2[1]) for ct in aggregated],
+        "resultPointX": [str(p[0]) for p in result_points],
+        "resultPointY": [str(p[1]) for p in result_points],
+        "totalVotes": str(total_votes),
+        "sk": str(sk),
+    }
+
+
+def tally_public_signals(witness):
+    """
+    Public signals of a tally witness in circuit declaration order.
+
+    For N candidates this is 2 + 6N + 1 values; indices 4N+2 .. 6N+1 hold
+    the result points that updateTallyResults stores.
+    """
+    signals = [witness["pkX"], witness["pkY"]]
+    for name in ("c1TotalX", "c1TotalY", "c2TotalX", "c2TotalY",
+                 "resultPointX", "resultPointY"):
+        signals.extend(witness[name])
+    signals.append(witness["totalVotes"])
+    return signals
+
+
+def build_vote_witness(candidate_id, num_candidates, pk):
+    """
+    Encrypt a fresh ballot and build its vote witness.
+
+    Returns:
+        (ciphertexts, witness)
+    """
+    randomness = [secrets.randbelow(SUBGROUP_ORDER - 1) + 1 for _ in range(num_candidates)]
+    ciphertexts = encrypt_vote_onehot(candidate_id, num_candidates, pk, randomness)
+    witness = prepare_vote_witness(candidate_id, random_salt(), pk, ciphertexts, randomness)
+    return ciphertexts, witness
+
+
+def _vote_witness_worker(args):
+    candidate_id, num_candidates, pk = args
+    return build_vote_witness(candidate_id, num_candidates, pk)[1]
+
+
+def _vote_witness_chunk(jobs):
+    return [_vote_witness_worker(job) for job in jobs]
+
+
+def generate_vote_witnesses(candidate_ids, num_candidates, pk, workers=None, chunksize=16):
+    """
+    Build vote witnesses for many ballots across worker processes.
+
+    Ballots are handed out in chunks through parallel.bounded_map, so
+    candidate_ids can be a long stream and results are yielded as they
+    complete.
+
+    Args:
+        candidate_ids: Iterable of chosen candidate indices
+        num_candidates: Number of candidates
+        pk: ElGamal public key point
+        workers: Number of worker processes (1 runs in-process)
+        chunksize: Ballots handed to a worker at a time
+
+    Yields:
+        Vote witness dictionaries, in the order of candidate_ids
+    """
+    jobs = ((cid, num_candidates, pk) for cid in candidate_ids)
+    for witnesses in bounded_map(_vote_witness_chunk, chunked(jobs, chunksize), workers):
+        yield from witnesses
+
+
+def build_tally_witness(all_votes, num_candidates, sk, pk):
+    """
+    Aggregate ballots and build the tally witness.
+
+    Result points are computed directly as C2 - sk*C1, so no discrete log
+    is needed to produce the witness.
+
+    Args:
+        all_votes: List of vote vectors (each is a list of ElGamalCiphertext)
+        num_candidates: Number of candidates
+        sk: Admin secret key
+        pk: ElGamal public key point
+
+    Returns:
+        Tally circuit input dictionary
+    """
+    if not all_votes:
+        raise ValueError("Cannot build tally witness without votes")
+
+    aggregated = aggregate_votes(all_votes, num_candidates)
+    result_points = [point_sub(ct.c2, scalar_mul(sk, ct.c1)) for ct in aggregated]
+    return prepare_tally_witness(sk, pk, aggregated, result_points, len(all_votes))
+
+
+def write_witnesses(witnesses, path):
+    """
+    Stream witnesses to a JSON Lines file, one circuit input per line.
+
+    Returns:
+        Number of witnesses written
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for witness in witnesses:
+            f.write(json.dumps(witness, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def read_witnesses(path):
+    """Iterate over witnesses written by write_witnesses."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
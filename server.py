@@ -1,3 +1,6 @@
+import logging
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -5,12 +8,36 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from crypto import tables
+
 FRONTEND_DIR = Path(__file__).resolve().parent / "frontend"
+ZK_DIR = FRONTEND_DIR / "zk"
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_tables(ready):
+    try:
+        tables.warm_up()
+    except Exception:
+        logger.exception("Crypto table warm-up failed; tables will be built on first use")
+    finally:
+        ready.set()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load precomputed tables in the background so requests are served immediately
+    app.state.tables_ready = threading.Event()
+    threading.Thread(target=_warm_tables, args=(app.state.tables_ready,), daemon=True).start()
+    yield
+
 
 app = FastAPI(
     title="区块链电子投票系统",
     description="基于以太坊的安全电子投票系统",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -37,5 +64,20 @@ async def config_js():
     return FileResponse(FRONTEND_DIR / "config.js", media_type="application/javascript")
 
 
+@app.get("/health")
+async def health():
+    ready = getattr(app.state, "tables_ready", None)
+    return {"status": "ok", "tablesReady": bool(ready and ready.is_set())}
+
+
+def _mount_zk(app, zk_dir):
+    """Serve provisioned ZK artifacts; returns whether /zk was mounted."""
+    if not zk_dir.is_dir():
+        logger.warning("%s not found; ZK artifacts will not be served", zk_dir)
+        return False
+    app.mount("/zk", StaticFiles(directory=zk_dir), name="zk")
+    return True
+
+
 app.mount("/lib", StaticFiles(directory=FRONTEND_DIR / "lib"), name="lib")
-app.mount("/zk", StaticFiles(directory=FRONTEND_DIR / "zk"), name="zk")
+_mount_zk(app, ZK_DIR)
@@ -0,0 +1,11 @@
+"""Suite-wide fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def table_cache(tmp_path_factory):
+    """Keep precomputed tables out of the user's ~/.cache during tests."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("EVOTING_TABLE_CACHE", str(tmp_path_factory.mktemp("table-cache")))
+        yield
@@ -0,0 +1,178 @@
+"""
+Tests for the independent-auditor tally verification.
+Tests cover: published tally parsing, streamed aggregation, tamper
+detection, rejected records, and report signatures pinned to the auditor key.
+"""
+
+import copy
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.elgamal import ElGamalKeyPair, encrypt_vote_onehot
+from crypto.events import encrypted_vote_record
+from crypto.witness import build_tally_witness, tally_public_signals
+from crypto.audit import (
+    published_tally_from_signals, load_published_tally, stream_aggregate,
+    audit_tally, sign_report, verify_report_signature, main,
+)
+
+
+ADMIN = ElGamalKeyPair.from_sk(86420)
+AUDITOR = ElGamalKeyPair.from_sk(13579)
+CHOICES = [0, 1, 1, 0, 1]
+VOTES = [encrypt_vote_onehot(c, 2, ADMIN.pk) for c in CHOICES]
+RECORDS = [encrypted_vote_record(i, i + 1, v) for i, v in enumerate(VOTES)]
+WITNESS = build_tally_witness(VOTES, 2, ADMIN.sk, ADMIN.pk)
+RESULTS = [2, 3]
+
+
+def published():
+    return published_tally_from_signals(RESULTS, tally_public_signals(WITNESS))
+
+
+def forged_pk(signed):
+    return tuple(int(v) for v in signed["signature"]["pk"])
+
+
+# ─── Published Tally Parsing Tests ───────────────────────────
+
+class TestPublishedTally:
+
+    def test_signal_layout(self):
+        """Public signals split into pk, totals, result points and total."""
+        pub = published()
+        assert pub["pk"] == ADMIN.pk
+        assert pub["resultPoints"][0] == (int(WITNESS["resultPointX"][0]), int(WITNESS["resultPointY"][0]))
+        assert pub["c2Total"][1] == (int(WITNESS["c2TotalX"][1]), int(WITNESS["c2TotalY"][1]))
+        assert pub["totalVotes"] == 5
+
+    def test_named_fields(self):
+        """Named tally fields parse to the same structure."""
+        data = dict(WITNESS, results=RESULTS)
+        assert load_published_tally(data) == published()
+
+    def test_named_fields_length_mismatch(self):
+        """A per-candidate list with an extra or missing value is rejected."""
+        data = dict(WITNESS, results=RESULTS)
+        data["c1TotalX"] = data["c1TotalX"] + ["1"]
+        with pytest.raises(ValueError, match="c1TotalX"):
+            load_published_tally(data)
+        data = dict(WITNESS, results=RESULTS)
+        data["resultPointY"] = data["resultPointY"][:1]
+        with pytest.raises(ValueError, match="resultPointY"):
+            load_published_tally(data)
+
+    def test_wrong_signal_count(self):
+        """Signal count must be 6N + 3."""
+        with pytest.raises(ValueError):
+            published_tally_from_signals(RESULTS, tally_public_signals(WITNESS)[:-1])
+
+
+# ─── Audit Tests ─────────────────────────────────────────────
+
+class TestAuditTally:
+
+    def test_stream_aggregate_chunks(self):
+        """Chunked parallel aggregation counts every ballot."""
+        aggregated, ballots, rejected = stream_aggregate(iter(RECORDS), 2, workers=2, chunk_size=2)
+        assert ballots == 5
+        assert rejected == []
+        assert aggregated[0].c1 == published()["c1Total"][0]
+
+    def test_valid_tally(self):
+        """An honest tally passes every check."""
+        report = audit_tally(RECORDS, published(), workers=1)
+        assert report["valid"]
+        assert report["ballots"] == 5
+        assert report["checks"]["resultPoints"] == [True, True]
+
+    def test_wrong_results(self):
+        """Claimed counts that disagree with the result points are caught."""
+        pub = published()
+        pub["results"] = [3, 2]
+        report = audit_tally(RECORDS, pub, workers=1)
+        assert not report["valid"]
+        assert report["checks"]["resultPoints"] == [False, False]
+
+    def test_missing_ballot(self):
+        """Dropping a ballot from the stream breaks aggregates and totals."""
+        report = audit_tally(RECORDS[1:], published(), workers=1)
+        assert not report["valid"]
+        assert not report["checks"]["totalVotes"]
+        assert report["checks"]["aggregates"] == [False, False]
+
+    def test_bad_records_reported(self):
+        """Malformed and off-curve payloads are listed, not raised, and invalidate the report."""
+        off_curve = copy.deepcopy(RECORDS[1])
+        off_curve["encryptedVote"][0] = "1"
+        records = RECORDS + [off_curve, {"event": "EncryptedVoteCast"}]
+        report = audit_tally(records, published(), workers=2, chunk_size=2)
+        assert not report["valid"]
+        assert report["ballots"] == 5
+        assert report["checks"]["aggregates"] == [True, True]
+        assert report["checks"]["rejectedCount"] == 2
+        assert [r["position"] for r in report["checks"]["rejectedRecords"]] == [5, 6]
+        assert "not on curve" in report["checks"]["rejectedRecords"][0]["reason"]
+
+    def test_only_bad_records(self):
+        """A stream of nothing but bad records still yields a report."""
+        report = audit_tally([{"encryptedVote": ["x"]}], published(), workers=1)
+        assert not report["valid"]
+        assert report["ballots"] == 0
+        assert report["checks"]["aggregates"] == [False, False]
+        assert report["checks"]["rejectedCount"] == 1
+
+    def test_empty_stream_raises(self):
+        """No ballots, nothing to audit."""
+        with pytest.raises(ValueError):
+            audit_tally([], published(), workers=1)
+
+
+# ─── Signature Tests ─────────────────────────────────────────
+
+class TestReportSignature:
+
+    def test_sign_verify(self):
+        """Signed report verifies and is deterministic."""
+        report = audit_tally(RECORDS, published(), workers=1)
+        signed = sign_report(report, AUDITOR)
+        assert verify_report_signature(signed, AUDITOR.pk)
+        assert sign_report(report, AUDITOR) == signed
+
+    def test_tampered_report(self):
+        """Changing the report invalidates the signature."""
+        signed = sign_report(audit_tally(RECORDS, published(), workers=1), AUDITOR)
+        tampered = copy.deepcopy(signed)
+        tampered["report"]["results"] = [5, 0]
+        assert not verify_report_signature(tampered, AUDITOR.pk)
+
+    def test_resigned_with_other_key(self):
+        """A tampered report re-signed with another key is rejected."""
+        report = audit_tally(RECORDS, published(), workers=1)
+        report["results"] = [5, 0]
+        forged = sign_report(report, ElGamalKeyPair.from_sk(24680))
+        assert verify_report_signature(forged, forged_pk(forged))
+        assert not verify_report_signature(forged, AUDITOR.pk)
+
+    def test_cli(self, tmp_path):
+        """CLI writes a signed report and exits 0 for a valid tally."""
+        events = tmp_path / "events.jsonl"
+        events.write_text("".join(json.dumps(r) + "\n" for r in RECORDS))
+        tally = tmp_path / "tally.json"
+        tally.write_text(json.dumps({"results": RESULTS, "publicSignals": tally_public_signals(WITNESS)}))
+        key = tmp_path / "key.json"
+        key.write_text(json.dumps(AUDITOR.to_dict()))
+        out = tmp_path / "report.json"
+
+        code = main(["--events", str(events), "--published", str(tally),
+                     "--key", str(key), "--output", str(out), "--workers", "1"])
+        assert code == 0
+        assert verify_report_signature(json.loads(out.read_text()), AUDITOR.pk)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
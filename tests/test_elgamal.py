@@ -1,7 +1,8 @@
 """
 Tests for BabyJubJub ElGamal encryption module.
 Tests cover: curve arithmetic, key generation, encryption/decryption,
-homomorphic addition, one-hot encoding, and discrete log solver.
+homomorphic addition, batch aggregation, one-hot encoding, and discrete
+log solver.
 """
 
 import pytest
@@ -18,7 +19,7 @@ from crypto.elgamal import (
     ElGamalKeyPair, ElGamalCiphertext,
     encrypt, decrypt, decrypt_to_point,
     homomorphic_add, encrypt_vote_onehot, homomorphic_tally,
-    solve_dlog,
+    solve_dlog, sum_points, generator_mul, in_subgroup, aggregate_votes, aggregate_votes_parallel,
 )
 
 
@@ -93,6 +94,17 @@ class TestBabyJubJubCurve:
         rhs = point_add(scalar_mul(a, GENERATOR), scalar_mul(b, GENERATOR))
         assert point_eq(lhs, rhs)
 
+    def test_in_subgroup(self):
+        """Subgroup check accepts multiples of G, rejects cofactor and off-curve points."""
+        assert in_subgroup(GENERATOR)
+        assert in_subgroup(IDENTITY)
+        assert in_subgroup(scalar_mul(987654321, GENERATOR))
+        order_two = (0, FIELD_PRIME - 1)
+        assert is_on_curve(order_two)
+        assert not in_subgroup(order_two)
+        assert not in_subgroup(point_add(GENERATOR, order_two))
+        assert not in_subgroup((1, 2))
+
     def test_point_on_curve_after_operations(self):
         """Points remain on curve after arithmetic operations."""
         p = scalar_mul(12345, GENERATOR)
@@ -103,6 +115,20 @@ class TestBabyJubJubCurve:
         assert is_on_curve(r)
 
 
+# ─── Fixed-Base Table Tests ──────────────────────────────────
+
+class TestGeneratorMul:
+
+    def test_matches_scalar_mul(self):
+        """generator_mul(k) == scalar_mul(k, G)."""
+        for k in [0, 1, 2, 15, 16, 12345, SUBGROUP_ORDER - 1]:
+            assert point_eq(generator_mul(k), scalar_mul(k, GENERATOR))
+
+    def test_reduces_mod_order(self):
+        """Scalars are reduced mod the subgroup order."""
+        assert point_eq(generator_mul(SUBGROUP_ORDER + 5), generator_mul(5))
+
+
 # ─── Key Generation Tests ───────────────────────────────────
 
 class TestKeyGeneration:
@@ -220,6 +246,41 @@ class TestHomomorphicAdd:
             homomorphic_add([])
 
 
+# ─── Batch Aggregation Tests ─────────────────────────────────
+
+class TestBatchAggregation:
+
+    def setup_method(self):
+        self.kp = ElGamalKeyPair.from_sk(24680)
+
+    def test_sum_points_matches_point_add(self):
+        """sum_points equals folding point_add."""
+        points = [scalar_mul(k, GENERATOR) for k in (3, 17, 29, 101)]
+        expected = IDENTITY
+        for p in points:
+            expected = point_add(expected, p)
+        assert point_eq(sum_points(points), expected)
+
+    def test_sum_points_empty(self):
+        """Empty sum is the identity."""
+        assert point_eq(sum_points([]), IDENTITY)
+
+    def test_parallel_matches_serial(self):
+        """Chunked parallel aggregation equals serial aggregation."""
+        votes = [encrypt_vote_onehot(c, 2, self.kp.pk) for c in (0, 1, 1, 0, 1)]
+        serial = aggregate_votes(votes, 2)
+        parallel = aggregate_votes_parallel(votes, 2, workers=2, chunk_size=2)
+        for a, b in zip(serial, parallel):
+            assert point_eq(a.c1, b.c1)
+            assert point_eq(a.c2, b.c2)
+        assert decrypt(parallel[1], self.kp.sk) == 3
+
+    def test_parallel_empty_raises(self):
+        """Aggregating no ballots should raise."""
+        with pytest.raises(ValueError):
+            aggregate_votes_parallel([], 2)
+
+
 # ─── One-Hot Vote Encoding Tests ─────────────────────────────
 
 class TestOneHotVoting:
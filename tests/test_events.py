@@ -0,0 +1,59 @@
+"""
+Tests for EncryptedVoteCast record encoding.
+Tests cover: record shape, ballot round-trip, payload validation and
+JSON Lines storage.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.elgamal import ElGamalKeyPair, encrypt_vote_onehot, point_eq
+from crypto.events import encrypted_vote_record, record_to_ballot, write_record, read_records
+
+
+# ─── Record Tests ────────────────────────────────────────────
+
+class TestRecords:
+
+    def setup_method(self):
+        self.kp = ElGamalKeyPair.from_sk(13579)
+        self.cts = encrypt_vote_onehot(1, 2, self.kp.pk)
+
+    def test_record_shape(self):
+        """Record matches EncryptedVoteCast(voter, commitment, encryptedVote)."""
+        record = encrypted_vote_record(0, 255, self.cts)
+        assert record["event"] == "EncryptedVoteCast"
+        assert record["voter"] == "0x" + "0" * 39 + "1"
+        assert record["commitment"] == "0x" + "0" * 62 + "ff"
+        assert len(record["encryptedVote"]) == 8
+
+    def test_roundtrip(self):
+        """Ballot survives record serialization."""
+        ballot = record_to_ballot(encrypted_vote_record(0, 1, self.cts), 2)
+        for a, b in zip(ballot, self.cts):
+            assert point_eq(a.c1, b.c1)
+            assert point_eq(a.c2, b.c2)
+
+    def test_rejects_bad_length(self):
+        """Payload length must be numCandidates * 4."""
+        with pytest.raises(ValueError):
+            record_to_ballot(encrypted_vote_record(0, 1, self.cts), 3)
+
+    def test_rejects_off_curve_point(self):
+        """Points off BabyJubJub are rejected at ingestion."""
+        record = encrypted_vote_record(0, 1, self.cts)
+        record["encryptedVote"][0] = "1"
+        with pytest.raises(ValueError):
+            record_to_ballot(record, 2)
+
+    def test_jsonl_roundtrip(self, tmp_path):
+        """Records written with write_record read back unchanged."""
+        records = [encrypted_vote_record(i, i + 1, self.cts) for i in range(3)]
+        path = tmp_path / "events.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                write_record(f, record)
+        assert list(read_records(path)) == records
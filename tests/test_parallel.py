@@ -0,0 +1,68 @@
+"""
+Tests for bounded fan-out to worker processes.
+Tests cover: chunking, in-order results in and out of process, lazy
+consumption of the input stream, and per-work-unit memory tracing.
+"""
+
+import pytest
+import sys
+import os
+import tracemalloc
+from itertools import count, islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.parallel import chunked, bounded_map, traced_map, traced_call
+
+
+def _square(x):
+    return x * x
+
+
+def _allocate(n):
+    return len(bytearray(n))
+
+
+class TestChunked:
+
+    def test_sizes(self):
+        """Last chunk holds the remainder."""
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert list(chunked([], 3)) == []
+
+
+class TestBoundedMap:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_in_order(self, workers):
+        """Results come back in input order."""
+        assert list(bounded_map(_square, range(20), workers)) == [x * x for x in range(20)]
+
+    def test_input_consumed_lazily(self):
+        """An unbounded input is only read as far as results are taken."""
+        results = bounded_map(_square, count(), workers=2)
+        assert list(islice(results, 5)) == [0, 1, 4, 9, 16]
+        results.close()
+
+
+class TestTracedMap:
+
+    def test_worker_peaks(self):
+        """Each work unit's peak is traced in its worker."""
+        results = list(traced_map(_allocate, [1 << 20, 1 << 10], workers=2))
+        assert [r for r, _ in results] == [1 << 20, 1 << 10]
+        assert results[0][1] >= 1 << 20
+        assert results[1][1] < 1 << 20
+
+    def test_leaves_callers_session_alone(self):
+        """In-process under an active session, no peak is taken and tracing continues."""
+        tracemalloc.start()
+        try:
+            assert traced_call(_square, 3) == (9, None)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
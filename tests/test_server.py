@@ -0,0 +1,56 @@
+"""
+Tests for the FastAPI server.
+Tests cover: table warm-up reported by /health and skipping /zk when the
+ZK artifacts are not provisioned.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import server
+
+
+# ─── Health Tests ────────────────────────────────────────────
+
+class TestHealth:
+
+    def test_tables_ready_after_warm_up(self):
+        """/health reports tablesReady once the background warm-up finishes."""
+        with TestClient(server.app) as client:
+            assert server.app.state.tables_ready.wait(timeout=120)
+            response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok", "tablesReady": True}
+
+
+# ─── Static Mount Tests ──────────────────────────────────────
+
+class TestZkMount:
+
+    def test_missing_zk_dir_skipped(self, tmp_path):
+        """Without provisioned artifacts /zk is not mounted and 404s."""
+        app = FastAPI()
+        assert not server._mount_zk(app, tmp_path / "zk")
+        assert TestClient(app).get("/zk/vote_proof.wasm").status_code == 404
+
+    def test_zk_dir_served(self, tmp_path):
+        """Provisioned artifacts are served under /zk."""
+        (tmp_path / "vote_proof.wasm").write_bytes(b"\0asm")
+        app = FastAPI()
+        assert server._mount_zk(app, tmp_path)
+        response = TestClient(app).get("/zk/vote_proof.wasm")
+        assert response.status_code == 200
+        assert response.content == b"\0asm"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
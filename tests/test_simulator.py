@@ -0,0 +1,127 @@
+"""
+Tests for the election load simulator.
+Tests cover: candidate sampling, percentiles, and an end-to-end run against both sinks.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.elgamal import ElGamalKeyPair
+from crypto.simulator import (
+    _percentile, _candidate_stream, sample_candidates, run_simulation, MockChain, FileSink,
+)
+
+
+# ─── Sampling Tests ──────────────────────────────────────────
+
+class TestSampling:
+
+    def test_seed_reproducible(self):
+        """Same seed draws the same candidates."""
+        assert sample_candidates(50, [1, 2, 3], seed=7) == sample_candidates(50, [1, 2, 3], seed=7)
+
+    def test_zero_weight_never_drawn(self):
+        """Candidates with zero weight get no votes."""
+        assert 1 not in sample_candidates(200, [1, 0, 1], seed=1)
+
+    def test_invalid_distribution(self):
+        """Empty or negative weights are rejected."""
+        with pytest.raises(ValueError):
+            sample_candidates(10, [])
+        with pytest.raises(ValueError):
+            sample_candidates(10, [1, -1])
+
+    def test_candidate_stream_matches_sample(self):
+        """Chunked draws reproduce the single-call sample."""
+        assert list(_candidate_stream(50, [1, 2, 3], seed=7, chunk_size=8)) == \
+            sample_candidates(50, [1, 2, 3], seed=7)
+
+    def test_percentile(self):
+        """Nearest-rank percentile."""
+        values = [float(i) for i in range(1, 101)]
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 99) == 99.0
+        assert _percentile([], 50) == 0.0
+
+
+# ─── End-to-End Tests ────────────────────────────────────────
+
+class TestRunSimulation:
+
+    def test_mock_chain(self):
+        """Pipeline tallies the sampled ballots and reports every stage."""
+        chain = MockChain()
+        report = run_simulation(4, [0.5, 0.5], keypair=ElGamalKeyPair.from_sk(42),
+                                sink=chain, workers=1, seed=3)
+        assert report["tallyMatches"]
+        assert sum(report["tally"]) == 4
+        assert len(chain) == 4
+        stages = {s["stage"]: s for s in report["stages"]}
+        assert list(stages) == ["encrypt", "ingest", "aggregate", "decrypt"]
+        assert stages["encrypt"]["count"] == stages["ingest"]["count"] == 4
+        assert stages["encrypt"]["throughputPerSec"] > 0
+        # Timed runs carry no memory figures
+        assert all(s["peakTracedBytes"] is None for s in report["stages"])
+
+    def test_file_sink(self, tmp_path):
+        """Records can be streamed through a JSONL file."""
+        sink = FileSink(tmp_path / "events.jsonl")
+        report = run_simulation(3, [1, 0, 1], keypair=ElGamalKeyPair.from_sk(42),
+                                sink=sink, workers=1, seed=5)
+        assert report["tallyMatches"]
+        assert report["tally"][1] == 0
+        assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 3
+
+    def test_per_chunk_latencies(self):
+        """Ingest and aggregate percentiles come from one sample per chunk."""
+        report = run_simulation(6, [1, 1], keypair=ElGamalKeyPair.from_sk(42),
+                                workers=2, chunk_size=2, seed=9)
+        assert report["tallyMatches"]
+        stages = {s["stage"]: s for s in report["stages"]}
+        assert stages["ingest"]["count"] == stages["aggregate"]["count"] == 6
+        for name in ("ingest", "aggregate"):
+            assert stages[name]["latencyMs"]["max"] >= stages[name]["latencyMs"]["p50"] > 0
+
+    def test_trace_memory_reports_no_timings(self):
+        """A traced run reports memory per stage, measured inside the workers, and no timings."""
+        report = run_simulation(3, [1, 1], keypair=ElGamalKeyPair.from_sk(42),
+                                workers=2, chunk_size=2, seed=9, trace_memory=True)
+        assert report["tallyMatches"]
+        for stage in report["stages"]:
+            assert stage["seconds"] is None
+            assert stage["latencyMs"] is None
+            assert stage["peakTracedBytes"] > 0
+        stages = {s["stage"]: s for s in report["stages"]}
+        assert stages["encrypt"]["workerPeakTracedBytes"] > 0
+        assert stages["aggregate"]["workerPeakTracedBytes"] > 0
+        assert stages["decrypt"]["workerPeakTracedBytes"] is None
+
+
+# ─── Mock Chain Tests ────────────────────────────────────────
+
+class TestMockChain:
+
+    def test_events_consumed(self):
+        """In-memory records are handed out once and then dropped."""
+        chain = MockChain()
+        for i in range(3):
+            chain.emit({"n": i})
+        assert [r["n"] for r in chain.events()] == [0, 1, 2]
+        assert list(chain.events()) == []
+        assert len(chain) == 3
+
+    def test_spool_to_disk(self, tmp_path):
+        """With a spool path, records go to JSON Lines instead of memory."""
+        path = tmp_path / "spool.jsonl"
+        chain = MockChain(spool_path=path)
+        for i in range(3):
+            chain.emit({"n": i})
+        assert [r["n"] for r in chain.events()] == [0, 1, 2]
+        assert len(path.read_text().splitlines()) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
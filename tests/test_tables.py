@@ -0,0 +1,191 @@
+"""
+Tests for lazily built precomputed tables.
+Tests cover: on-first-use construction, the on-disk cache and its keys,
+digest and validator checks on load, bounded baby-step caching,
+disabling the cache, warm-up, and lazy package imports.
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto import tables
+from crypto import elgamal
+
+
+class CountingBuilder:
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVOTING_TABLE_CACHE", str(tmp_path))
+    yield tmp_path
+    for name in ("test-table", "test-table-v2"):
+        tables.clear(name)
+
+
+# ─── Table Cache Tests ───────────────────────────────────────
+
+class TestTableCache:
+
+    def test_built_once_in_memory(self, cache):
+        """Builder runs on first use only."""
+        builder = CountingBuilder([1, 2, 3])
+        tables.register("test-table", (1,), builder)
+        assert not tables.is_loaded("test-table")
+        assert tables.get("test-table") == [1, 2, 3]
+        assert tables.get("test-table") == [1, 2, 3]
+        assert builder.calls == 1
+
+    def test_loaded_from_disk(self, cache):
+        """A fresh process (simulated by clear) loads the serialized table."""
+        tables.register("test-table", (1,), CountingBuilder({(1, 2): 3}))
+        tables.get("test-table")
+        tables.clear("test-table")
+
+        builder = CountingBuilder(None)
+        tables.register("test-table", (1,), builder)
+        assert tables.get("test-table") == {(1, 2): 3}
+        assert builder.calls == 0
+        assert len(list(cache.glob("test-table-*.marshal"))) == 1
+
+    def test_params_change_key(self, cache):
+        """Different parameters never reuse a cached table."""
+        tables.register("test-table", (1,), CountingBuilder("a"))
+        tables.get("test-table")
+        tables.clear("test-table")
+
+        tables.register("test-table", (2,), CountingBuilder("b"))
+        assert tables.get("test-table") == "b"
+        assert len(list(cache.glob("test-table-*.marshal"))) == 2
+
+    def test_corrupt_file_rebuilds(self, cache):
+        """An unreadable cache file falls back to building."""
+        tables.register("test-table", (1,), CountingBuilder("a"))
+        tables.get("test-table")
+        tables.clear("test-table")
+        for path in cache.glob("test-table-*.marshal"):
+            path.write_bytes(b"\x00garbage")
+
+        builder = CountingBuilder("a")
+        tables.register("test-table", (1,), builder)
+        assert tables.get("test-table") == "a"
+        assert builder.calls == 1
+
+    def test_tampered_payload_rebuilds(self, cache):
+        """A payload that no longer matches its digest is rebuilt and rewritten."""
+        tables.register("test-table", (1,), CountingBuilder([1, 2, 3]))
+        tables.get("test-table")
+        tables.clear("test-table")
+        (path,) = cache.glob("test-table-*.marshal")
+        data = path.read_bytes()
+        path.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+
+        builder = CountingBuilder([1, 2, 3])
+        tables.register("test-table", (1,), builder)
+        assert tables.get("test-table") == [1, 2, 3]
+        assert builder.calls == 1
+        assert path.read_bytes() == data
+
+    def test_validator_rejects_rebuilds(self, cache):
+        """A loaded table that fails its validator is rebuilt."""
+        tables.register("test-table", (1,), CountingBuilder([1, 2, 3]))
+        tables.get("test-table")
+        tables.clear("test-table")
+
+        builder = CountingBuilder([1, 2, 3])
+        tables.register("test-table", (1,), builder, validate=lambda t: t[5] == 0)
+        assert tables.get("test-table") == [1, 2, 3]
+        assert builder.calls == 1
+
+    def test_cache_disabled(self, cache, monkeypatch):
+        """An empty EVOTING_TABLE_CACHE disables the disk cache."""
+        monkeypatch.setenv("EVOTING_TABLE_CACHE", "")
+        tables.register("test-table-v2", (1,), CountingBuilder("x"))
+        assert tables.get("test-table-v2") == "x"
+        assert not list(cache.iterdir())
+
+    def test_unknown_table(self):
+        """Unregistered names raise KeyError."""
+        with pytest.raises(KeyError):
+            tables.get("no-such-table")
+
+
+# ─── Curve Table Validation Tests ────────────────────────────
+
+class TestCurveTables:
+
+    def test_generator_table_spot_check(self):
+        """A window table with a wrong entry fails validation."""
+        table = [list(row) for row in tables.get("generator-window")]
+        assert elgamal._generator_table_ok(table)
+        table[7][-1] = table[7][-2]
+        assert not elgamal._generator_table_ok(table)
+        assert not elgamal._generator_table_ok(table[:-1])
+
+    def test_baby_step_spot_check(self):
+        """A baby-step table with a wrong giant step fails validation."""
+        baby_steps, giant_step = tables.get("baby-steps-101")
+        assert elgamal._baby_steps_ok((baby_steps, giant_step))
+        assert not elgamal._baby_steps_ok((baby_steps, elgamal.GENERATOR))
+
+    def test_non_default_step_not_on_disk(self, cache):
+        """Only the default step size is registered and written to disk."""
+        assert elgamal.solve_dlog(elgamal.generator_mul(12345), max_value=20000) == 12345
+        assert not tables.is_registered("baby-steps-142")
+        assert not list(cache.glob("baby-steps-*.marshal"))
+
+
+# ─── Warm-Up Tests ───────────────────────────────────────────
+
+class TestWarmUp:
+
+    def test_default_tables(self, cache):
+        """Warm-up loads the generator, default baby-step and circuit Poseidon tables."""
+        names = tables.warm_up()
+        for name in ("generator-window", "baby-steps-101", "poseidon-t3", "poseidon-t9"):
+            assert name in names
+            assert tables.is_loaded(name)
+
+
+# ─── Lazy Import Tests ───────────────────────────────────────
+
+class TestLazyImport:
+
+    def test_import_crypto_is_lazy(self):
+        """import crypto does not load submodules until an export is used."""
+        code = (
+            "import sys, crypto; "
+            "assert 'crypto.elgamal' not in sys.modules; "
+            "crypto.ElGamalKeyPair; "
+            "assert 'crypto.elgamal' in sys.modules; "
+            "assert 'crypto.threshold' not in sys.modules"
+        )
+        root = os.path.join(os.path.dirname(__file__), "..")
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+    def test_no_multiprocessing_on_import(self):
+        """No crypto module imports concurrent.futures until a pool is used."""
+        code = (
+            "import sys; "
+            "import crypto.elgamal, crypto.threshold, crypto.witness, "
+            "crypto.audit, crypto.simulator, crypto.parallel; "
+            "assert 'concurrent.futures.process' not in sys.modules, 'pool imported'"
+        )
+        root = os.path.join(os.path.dirname(__file__), "..")
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
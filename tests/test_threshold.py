@@ -0,0 +1,238 @@
+"""
+Tests for threshold ElGamal module.
+Tests cover: Lagrange interpolation, distributed key generation, batched
+partial decryption proofs, share combination, and the multi-process
+trustee pool.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.elgamal import (
+    FIELD_PRIME, SUBGROUP_ORDER, GENERATOR,
+    scalar_mul, point_add, point_eq,
+    encrypt, encrypt_vote_onehot, aggregate_votes,
+)
+from crypto.threshold import (
+    lagrange_coefficient, deal_polynomial, verify_sub_share,
+    combine_sub_shares, joint_key, distributed_keygen, partial_decrypt, verify_partial_decryption,
+    combine_partial_decryptions, threshold_tally,
+    TrusteeShare, ThresholdKey, PartialDecryption, LocalTrusteePool,
+)
+
+
+# Shared 2-of-3 key; DKG is the slowest step so build it once
+KEY, SHARES = distributed_keygen(3, 2)
+
+
+# ─── Lagrange Interpolation Tests ────────────────────────────
+
+class TestLagrange:
+
+    def test_interpolates_constant_term(self):
+        """sum lambda_i * f(i) recovers f(0)."""
+        coeffs = [1234, 5678, 91011]
+        f = lambda x: sum(c * x ** k for k, c in enumerate(coeffs)) % SUBGROUP_ORDER
+        indices = [2, 4, 7]
+        total = sum(lagrange_coefficient(i, indices) * f(i) for i in indices)
+        assert total % SUBGROUP_ORDER == coeffs[0]
+
+    def test_single_index(self):
+        """A lone trustee has coefficient 1."""
+        assert lagrange_coefficient(3, [3]) == 1
+
+
+# ─── Distributed Key Generation Tests ───────────────────────
+
+class TestDistributedKeygen:
+
+    def test_shares_interpolate_to_pk(self):
+        """Any threshold subset of shares reconstructs the key behind pk."""
+        for subset in ([SHARES[0], SHARES[1]], [SHARES[1], SHARES[2]]):
+            indices = [s.index for s in subset]
+            sk = sum(lagrange_coefficient(s.index, indices) * s.share
+                     for s in subset) % SUBGROUP_ORDER
+            assert point_eq(scalar_mul(sk, GENERATOR), KEY.pk)
+
+    def test_verification_keys_match_shares(self):
+        """Published verification keys equal share * G."""
+        for share in SHARES:
+            assert point_eq(KEY.verification_keys[share.index], share.verification_key)
+
+    def test_feldman_rejects_tampered_sub_share(self):
+        """A modified sub-share fails the commitment check."""
+        commitments, sub_shares = deal_polynomial(2, 3)
+        assert verify_sub_share(1, sub_shares[1], commitments)
+        assert not verify_sub_share(1, sub_shares[1] + 1, commitments)
+
+    def test_per_trustee_steps(self):
+        """DKG run as separate dealer/trustee/public steps yields a working key."""
+        n, t = 3, 2
+        # Each trustee deals on its own machine
+        dealings = {d: deal_polynomial(t, n) for d in range(1, n + 1)}
+        published = {d: commitments for d, (commitments, _) in dealings.items()}
+        # Each trustee only sees the sub-shares addressed to it
+        shares = [
+            combine_sub_shares(i, {d: sub[i] for d, (_, sub) in dealings.items()}, published, t)
+            for i in range(1, n + 1)
+        ]
+        key = joint_key(published, t, n)
+
+        for share in shares:
+            assert point_eq(key.verification_keys[share.index], share.verification_key)
+        ct = encrypt(4, key.pk)
+        partials = [partial_decrypt(shares[0], [ct]), partial_decrypt(shares[2], [ct])]
+        assert combine_partial_decryptions([ct], partials, key, max_value=10) == [4]
+
+    def test_combine_sub_shares_rejects_bad_dealer(self):
+        """A tampered or missing sub-share names the offending dealer."""
+        dealings = {d: deal_polynomial(2, 2) for d in (1, 2)}
+        published = {d: c for d, (c, _) in dealings.items()}
+        received = {d: sub[1] for d, (_, sub) in dealings.items()}
+        received[2] += 1
+        with pytest.raises(ValueError, match="dealer 2"):
+            combine_sub_shares(1, received, published, 2)
+        del received[2]
+        with pytest.raises(ValueError, match="Missing"):
+            combine_sub_shares(1, received, published, 2)
+
+    def test_wrong_degree_dealing_rejected(self):
+        """A dealer using a degree-t polynomial passes Feldman but is rejected by length."""
+        n, t = 3, 2
+        dealings = {d: deal_polynomial(t, n) for d in (1, 3)}
+        dealings[2] = deal_polynomial(t + 1, n)
+        published = {d: c for d, (c, _) in dealings.items()}
+        received = {d: sub[1] for d, (_, sub) in dealings.items()}
+        assert verify_sub_share(1, received[2], published[2])
+        with pytest.raises(ValueError, match="Dealer 2 published 3 commitments"):
+            combine_sub_shares(1, received, published, t)
+        with pytest.raises(ValueError, match="Dealer 2"):
+            joint_key(published, t, n)
+
+    def test_short_dealing_rejected(self):
+        """Too few commitments raise ValueError, not IndexError."""
+        n, t = 3, 2
+        published = {d: deal_polynomial(t, n)[0] for d in range(1, n + 1)}
+        published[3] = published[3][:1]
+        with pytest.raises(ValueError, match="Dealer 3 published 1 commitments"):
+            joint_key(published, t, n)
+
+    def test_small_order_commitment_rejected(self):
+        """Commitments with a small-order component are rejected."""
+        n, t = 2, 2
+        published = {d: deal_polynomial(t, n)[0] for d in range(1, n + 1)}
+        c = published[1][1]
+        published[1][1] = (FIELD_PRIME - c[0], FIELD_PRIME - c[1])  # c + (0, -1)
+        with pytest.raises(ValueError, match="Dealer 1 published a commitment outside"):
+            joint_key(published, t, n)
+
+    def test_invalid_threshold_raises(self):
+        """Threshold must lie in [1, num_trustees]."""
+        with pytest.raises(ValueError):
+            distributed_keygen(3, 4)
+        with pytest.raises(ValueError):
+            distributed_keygen(3, 0)
+
+    def test_serialization(self):
+        """Key material round-trips through dict serialization."""
+        key2 = ThresholdKey.from_dict(KEY.to_dict())
+        assert point_eq(key2.pk, KEY.pk)
+        assert key2.threshold == KEY.threshold
+        assert key2.verification_keys == KEY.verification_keys
+        share2 = TrusteeShare.from_dict(SHARES[0].to_dict())
+        assert share2.index == SHARES[0].index
+        assert share2.share == SHARES[0].share
+
+
+# ─── Partial Decryption Tests ────────────────────────────────
+
+class TestPartialDecryption:
+
+    def setup_method(self):
+        self.cts = [encrypt(3, KEY.pk), encrypt(5, KEY.pk)]
+
+    def test_partial_points(self):
+        """Partial decryption is sk_i * C1_j."""
+        partial = partial_decrypt(SHARES[0], self.cts)
+        for ct, point in zip(self.cts, partial.points):
+            assert point_eq(point, scalar_mul(SHARES[0].share, ct.c1))
+
+    def test_batch_proof_verifies(self):
+        """Honest batch proof verifies against the trustee's verification key."""
+        partial = partial_decrypt(SHARES[1], self.cts)
+        assert verify_partial_decryption(partial, self.cts, KEY.verification_keys[2])
+
+    def test_batch_proof_rejects_tampered_point(self):
+        """Changing any one partial in the batch breaks the proof."""
+        partial = partial_decrypt(SHARES[1], self.cts)
+        partial.points[1] = point_add(partial.points[1], GENERATOR)
+        assert not verify_partial_decryption(partial, self.cts, KEY.verification_keys[2])
+
+    def test_batch_proof_rejects_wrong_key(self):
+        """Proof does not verify under another trustee's key."""
+        partial = partial_decrypt(SHARES[1], self.cts)
+        assert not verify_partial_decryption(partial, self.cts, KEY.verification_keys[1])
+
+    def test_rejects_small_order_component(self):
+        """A partial with a cofactor component is rejected outright."""
+        partial = partial_decrypt(SHARES[1], self.cts)
+        partial.points[0] = point_add(partial.points[0], (0, FIELD_PRIME - 1))
+        assert not verify_partial_decryption(partial, self.cts, KEY.verification_keys[2])
+
+    def test_rejects_off_curve_point(self):
+        """A partial with an off-curve point is rejected outright."""
+        partial = partial_decrypt(SHARES[1], self.cts)
+        partial.points[1] = (1, 2)
+        assert not verify_partial_decryption(partial, self.cts, KEY.verification_keys[2])
+
+    def test_combine(self):
+        """Threshold partials combine to the plaintexts."""
+        partials = [partial_decrypt(SHARES[0], self.cts), partial_decrypt(SHARES[2], self.cts)]
+        assert combine_partial_decryptions(self.cts, partials, KEY, max_value=100) == [3, 5]
+
+    def test_combine_skips_invalid_partial(self):
+        """A bad partial is dropped as long as enough valid ones remain."""
+        bad = partial_decrypt(SHARES[0], self.cts)
+        bad.points[0] = GENERATOR
+        partials = [bad] + [partial_decrypt(s, self.cts) for s in SHARES[1:]]
+        assert combine_partial_decryptions(self.cts, partials, KEY, max_value=100) == [3, 5]
+
+    def test_combine_below_threshold_raises(self):
+        """One partial is not enough for a 2-of-3 key."""
+        partials = [partial_decrypt(SHARES[0], self.cts)]
+        with pytest.raises(ValueError):
+            combine_partial_decryptions(self.cts, partials, KEY, max_value=100)
+
+    def test_serialization(self):
+        """Partial decryption round-trips through dict serialization."""
+        partial = partial_decrypt(SHARES[0], self.cts)
+        partial2 = PartialDecryption.from_dict(partial.to_dict())
+        assert verify_partial_decryption(partial2, self.cts, KEY.verification_keys[1])
+
+
+# ─── Trustee Pool Tests ──────────────────────────────────────
+
+class TestLocalTrusteePool:
+
+    def test_threshold_tally(self):
+        """Votes tally correctly with trustees in separate processes."""
+        votes = [
+            encrypt_vote_onehot(0, 2, KEY.pk),
+            encrypt_vote_onehot(1, 2, KEY.pk),
+            encrypt_vote_onehot(0, 2, KEY.pk),
+        ]
+        with LocalTrusteePool(SHARES[:2]) as pool:
+            assert threshold_tally(votes, 2, KEY, pool) == [2, 1]
+
+    def test_pool_requires_context(self):
+        """Using the pool outside a with-block raises."""
+        pool = LocalTrusteePool(SHARES)
+        with pytest.raises(RuntimeError):
+            pool.partial_decrypt_all(aggregate_votes([encrypt_vote_onehot(0, 2, KEY.pk)], 2))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
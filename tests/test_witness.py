@@ -0,0 +1,169 @@
+"""
+Tests for Poseidon hashing and circuit witness preparation.
+Tests cover: circomlib Poseidon vectors, vote/tally witness layout,
+public signal ordering, bulk generation, and JSONL streaming.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crypto.elgamal import (
+    GENERATOR, ElGamalKeyPair,
+    scalar_mul, encrypt_vote_onehot,
+)
+from crypto.poseidon import MAX_INPUTS, poseidon
+from crypto.witness import (
+    compute_commitment, compute_ciphertext_hash,
+    prepare_vote_witness, vote_public_signals,
+    build_tally_witness, tally_public_signals,
+    generate_vote_witnesses, write_witnesses, read_witnesses,
+)
+
+
+# ─── Poseidon Tests ──────────────────────────────────────────
+
+# circomlib Poseidon(n) of [1, 2, ..., n]
+CIRCOMLIB_VECTORS = {
+    1: 0x29176100eaa962bdc1fe6c654d6a3c130e96a4d1168b33848b897dc502820133,
+    2: 0x115cc0f5e7d690413df64c6b9662e9cf2a3617f2743245519e19607a4417189a,
+    3: 0x0e7732d89e6939c0ff03d5e58dab6302f3230e269dc5b968f725df34ab36d732,
+    4: 0x299c867db6c1fdd79dcefa40e4510b9837e60ebb1ce0663dbaa525df65250465,
+    5: 0x0dab9449e4a1398a15224c0b15a49d598b2174d305a316c918125f8feeb123c0,
+    6: 0x2d1a03850084442813c8ebf094dea47538490a68b05f2239134a4cca2f6302e1,
+    7: 0x1c2f3482dbb140c4ebb9ada49abdbc374a9a85fcfc6533ec2e9df45b4921c318,
+    8: 0x2921ab9bd0140cbc98e40395c0fefb40337a4d54fbbecd9a4d43b3d8d0c4d8d1,
+    9: 0x1e0b893aa2ad802275e749d260330b7675b22bb3aaa4461d204af32e60cd9078,
+    10: 0x0816126a09c29ecfcc0628461dacfb9459816fc60d6738b78db9ad07206fdc21,
+    11: 0x07e5b070aa2dba008f30a6b785b6c5ae2429e211f71cacdbdae0e07fc05b47a8,
+    12: 0x058814945232937db248a01e7cc55b3d681cc08702c8168494e856c1ef7693b5,
+}
+
+
+class TestPoseidon:
+
+    @pytest.mark.parametrize("n", sorted(CIRCOMLIB_VECTORS))
+    def test_circomlib_vectors(self, n):
+        """Poseidon([1..n]) matches circomlib for every accepted width."""
+        assert poseidon(list(range(1, n + 1))) == CIRCOMLIB_VECTORS[n]
+
+    def test_every_accepted_width_has_vector(self):
+        """No width is accepted without a circomlib vector above."""
+        assert sorted(CIRCOMLIB_VECTORS) == list(range(1, MAX_INPUTS + 1))
+
+    def test_circomlib_vector_ciphertext_hash(self):
+        """A real two-candidate ciphertextHash matches circomlib."""
+        kp = ElGamalKeyPair.from_sk(12345)
+        cts = encrypt_vote_onehot(1, 2, kp.pk, randomness_list=[111, 222])
+        assert compute_ciphertext_hash(cts) == \
+            0x0c8974d51b04f10eff7cde3def3fdea3e226b947f15a4ee2b193788d74165af5
+
+    def test_unsupported_width(self):
+        """Widths not checked against circomlib are rejected."""
+        with pytest.raises(ValueError):
+            poseidon(list(range(MAX_INPUTS + 1)))
+        with pytest.raises(ValueError):
+            poseidon([])
+
+
+# ─── Vote Witness Tests ──────────────────────────────────────
+
+class TestVoteWitness:
+
+    def setup_method(self):
+        self.kp = ElGamalKeyPair.from_sk(12345)
+        self.r = [111, 222]
+        self.cts = encrypt_vote_onehot(1, 2, self.kp.pk, randomness_list=self.r)
+
+    def test_fields(self):
+        """Witness carries every vote_proof input as strings."""
+        w = prepare_vote_witness(1, 42, self.kp.pk, self.cts, self.r)
+        assert w["candidateId"] == "1"
+        assert w["salt"] == "42"
+        assert w["r"] == ["111", "222"]
+        assert w["c1X"] == [str(ct.c1[0]) for ct in self.cts]
+        assert w["c2Y"] == [str(ct.c2[1]) for ct in self.cts]
+        assert w["commitment"] == str(compute_commitment(1, 42))
+        assert w["ciphertextHash"] == str(compute_ciphertext_hash(self.cts))
+
+    def test_ciphertext_hash_order(self):
+        """Ciphertext hash covers c1x, c1y, c2x, c2y per position."""
+        flat = self.cts[0].to_flat() + self.cts[1].to_flat()
+        assert compute_ciphertext_hash(self.cts) == poseidon(flat)
+
+    def test_public_signals(self):
+        """Vote public signals match castVote's layout."""
+        w = prepare_vote_witness(1, 42, self.kp.pk, self.cts, self.r)
+        assert vote_public_signals(w) == [
+            w["commitment"], w["ciphertextHash"], str(self.kp.pk[0]), str(self.kp.pk[1]),
+        ]
+
+
+# ─── Tally Witness Tests ─────────────────────────────────────
+
+class TestTallyWitness:
+
+    def setup_method(self):
+        self.kp = ElGamalKeyPair.from_sk(77777)
+        self.votes = [encrypt_vote_onehot(c, 2, self.kp.pk) for c in (0, 1, 0)]
+
+    def test_result_points(self):
+        """Result points equal results[j] * G."""
+        w = build_tally_witness(self.votes, 2, self.kp.sk, self.kp.pk)
+        two_g = scalar_mul(2, GENERATOR)
+        assert w["resultPointX"] == [str(two_g[0]), str(GENERATOR[0])]
+        assert w["resultPointY"] == [str(two_g[1]), str(GENERATOR[1])]
+        assert w["totalVotes"] == "3"
+        assert w["sk"] == str(self.kp.sk)
+
+    def test_public_signals_layout(self):
+        """15 public signals with result points at indices 10..13."""
+        w = build_tally_witness(self.votes, 2, self.kp.sk, self.kp.pk)
+        signals = tally_public_signals(w)
+        assert len(signals) == 15
+        assert signals[:2] == [str(self.kp.pk[0]), str(self.kp.pk[1])]
+        assert signals[10:12] == w["resultPointX"]
+        assert signals[12:14] == w["resultPointY"]
+        assert signals[14] == "3"
+
+    def test_empty_raises(self):
+        """No ballots, no tally witness."""
+        with pytest.raises(ValueError):
+            build_tally_witness([], 2, self.kp.sk, self.kp.pk)
+
+
+# ─── Bulk Generation Tests ───────────────────────────────────
+
+class TestBulkWitnesses:
+
+    def test_stream_roundtrip(self, tmp_path):
+        """Bulk witnesses stream to JSONL and read back in order."""
+        kp = ElGamalKeyPair.from_sk(99999)
+        ids = [0, 1, 1, 0]
+        path = tmp_path / "votes.jsonl"
+        count = write_witnesses(generate_vote_witnesses(ids, 2, kp.pk, workers=2), path)
+        assert count == 4
+
+        loaded = list(read_witnesses(path))
+        assert [w["candidateId"] for w in loaded] == ["0", "1", "1", "0"]
+        for w in loaded:
+            assert w["commitment"] == str(compute_commitment(int(w["candidateId"]), int(w["salt"])))
+
+    def test_bounded_stream_order(self):
+        """Many small chunks come back in input order."""
+        kp = ElGamalKeyPair.from_sk(99999)
+        ids = [0, 1, 1, 0, 1, 0, 0]
+        witnesses = list(generate_vote_witnesses(iter(ids), 2, kp.pk, workers=2, chunksize=1))
+        assert [int(w["candidateId"]) for w in witnesses] == ids
+
+    def test_in_process(self):
+        """workers=1 builds witnesses without a process pool."""
+        kp = ElGamalKeyPair.from_sk(99999)
+        witnesses = list(generate_vote_witnesses([1], 2, kp.pk, workers=1))
+        assert witnesses[0]["pkX"] == str(kp.pk[0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])